@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+for p in (ROOT, SRC):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+import networkx as nx
+import numpy as np
+
+from chandisvrp.config import load_config
+from chandisvrp.geo.osm_graph import load_compiled_graph
+from chandisvrp.geo.routing import RouteQueryEngine
+
+
+def main(config: str = "configs/default.yaml", n_queries: int = 500) -> None:
+    cfg = load_config(config)
+    g, cg = load_compiled_graph(cfg["place"], cfg["data"]["graph_path"], use_osm=bool(cfg["graph"]["use_osm"]), synthetic_cfg=cfg["graph"]["synthetic"])
+    t0 = time.perf_counter()
+    engine = RouteQueryEngine(cg)
+    prep = time.perf_counter() - t0
+    rng = np.random.default_rng(int(cfg["seed"]))
+    pairs = rng.choice(cg.node_ids, size=(n_queries, 2))
+
+    t0 = time.perf_counter()
+    alt = [engine.query(int(u), int(v))[0] for u, v in pairs]
+    t_alt = time.perf_counter() - t0
+
+    ref = []
+    t0 = time.perf_counter()
+    for u, v in pairs:
+        try:
+            ref.append(nx.shortest_path_length(g, int(u), int(v), weight="length_m"))
+        except nx.NetworkXNoPath:
+            ref.append(float("inf"))
+    t_nx = time.perf_counter() - t0
+
+    mismatches = sum(1 for a, b in zip(alt, ref) if not (a == b or np.isclose(a, b)))
+    print(f"graph: {cg.n_nodes} nodes, {cg.n_edges} edges | landmarks: {len(engine.landmarks)} (prep {prep:.2f}s)")
+    print(f"ALT bidirectional A*: {1e3 * t_alt / n_queries:.3f} ms/query")
+    print(f"networkx dijkstra:    {1e3 * t_nx / n_queries:.3f} ms/query")
+    print(f"speedup: {t_nx / max(t_alt, 1e-12):.1f}x | mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
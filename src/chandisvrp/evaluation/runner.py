@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import time
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 import networkx as nx
 import numpy as np
@@ -12,15 +12,26 @@ import pandas as pd
 
 from chandisvrp.evaluation.io import write_metadata, write_results
 from chandisvrp.evaluation.metrics import cvr
+from chandisvrp.geo.compiled import CompiledGraph, compile_graph
+from chandisvrp.geo.matrix import instance_matrix
+from chandisvrp.instances.compiled import compile_instance
 from chandisvrp.instances.serialization import load_instance
 from chandisvrp.solvers.abc_solver import ABCSolver
 from chandisvrp.solvers.aco_solver import ACOSolver
 from chandisvrp.solvers.alns_solver import ALNSSolver
-from chandisvrp.solvers.constructive import NearestNeighbor2OptSolver, NearestNeighborSolver, RandomSolver
+from chandisvrp.solvers.base import Solver
+from chandisvrp.solvers.constructive import (
+    NearestNeighbor2OptSolver,
+    NearestNeighborSolver,
+    RandomSolver,
+)
 from chandisvrp.solvers.hybrid_aco_abc import HybridACOABCSolver
+from chandisvrp.solvers.islands import IslandSolver
 from chandisvrp.solvers.ortools_solver import OrtoolsSolver
+from chandisvrp.solvers.pipeline import LocalSearchSolver, PipelineSolver
 from chandisvrp.stochastic.simulator import simulate_plan
-
+from chandisvrp.stochastic.td_matrix import TimeDependentMatrix, evaluate_plan
+from chandisvrp.types import Instance
 
 SOLVERS = {
     "nn2opt": NearestNeighbor2OptSolver,
@@ -31,17 +42,44 @@ SOLVERS = {
     "aco": ACOSolver,
     "hybrid_aco_abc": HybridACOABCSolver,
     "alns": ALNSSolver,
+    "ls": LocalSearchSolver,
 }
 
 
+def make_solver(
+    name: str, stall_s: float | None = None, stall_evals: int | None = None, start_s: float | None = None
+) -> Solver:
+    """Solver for a config name.
+
+    ``<solver>@<n>`` runs ``n`` islands of it in parallel; ``a>b>c`` is a pipeline in which each
+    stage starts from the previous stage's plan (e.g. ``nn2opt>alns>ls``). ``stall_s`` and
+    ``stall_evals`` set the early stop of every solver involved, ``start_s`` the depot departure
+    that time-window-aware solvers plan against (it must match the one plans are scored with).
+    """
+    if ">" in name:
+        solver: Solver = PipelineSolver([make_solver(stage.strip(), stall_s, stall_evals, start_s) for stage in name.split(">")])
+    else:
+        base, _, islands = name.partition("@")
+        solver = IslandSolver(SOLVERS[base], int(islands)) if islands else SOLVERS[name]()
+    solver.stall_s, solver.stall_evals = stall_s, stall_evals
+    if start_s is not None:
+        solver.start_s = float(start_s)
+    return solver
+
+
 class BenchmarkRunner:
-    def __init__(self, g: nx.MultiDiGraph, cfg: dict[str, Any]):
+    def __init__(self, g: nx.MultiDiGraph, cfg: dict[str, Any], cg: CompiledGraph | None = None):
         self.g = g
+        self.cg = cg if cg is not None else compile_graph(g)
         self.cfg = cfg
+        self.traces = pd.DataFrame()
 
-    def run(self, instance_paths: list[Path]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    def run(self, instance_paths: Sequence[Path | Instance]) -> tuple[pd.DataFrame, pd.DataFrame]:
         rows = []
+        trace_rows = []
         eval_cfg = self.cfg["evaluation"]
+        stoch_cfg = self.cfg["stochastic"]
+        start_s = float(stoch_cfg.get("start_hour", 8.0)) * 3600.0
         total_jobs = len(instance_paths) * len(eval_cfg["run_seeds"]) * len(eval_cfg["solvers"])
         job_idx = 0
         print(f"[runner] running {total_jobs} jobs across {len(instance_paths)} instances", end="\n")
@@ -60,7 +98,10 @@ class BenchmarkRunner:
             last_line_len = len(text)
 
         for i, p in enumerate(instance_paths, start=1):
-            instance = load_instance(p)
+            instance = p if isinstance(p, Instance) else load_instance(p)
+            matrix = instance_matrix(self.cg, instance, self.cfg["data"].get("matrix_cache_dir"), self.cfg.get("matrix"))
+            compiled = compile_instance(instance, matrix)
+            td = TimeDependentMatrix(matrix, stoch_cfg, float(stoch_cfg.get("td_slice_min", 15)), compiled.rows)
             for seed in eval_cfg["run_seeds"]:
                 for sname in eval_cfg["solvers"]:
                     job_idx += 1
@@ -69,14 +110,21 @@ class BenchmarkRunner:
                         f"inst={instance.instance_id} | solver={sname} | seed={seed}"
                     )
                     rng = np.random.default_rng(seed)
-                    solver = SOLVERS[sname]()
+                    solver = make_solver(sname, eval_cfg.get("stall_s"), eval_cfg.get("stall_evals"), start_s)
                     t0 = time.time()
-                    plan = solver.solve(self.g, instance, rng, float(eval_cfg["time_limit_s"]))
+                    plan = solver.solve(self.g, instance, rng, float(eval_cfg["time_limit_s"]), compiled=compiled)
                     solve_time = time.time() - t0
-                    outcomes = [simulate_plan(self.g, instance, plan, self.cfg["stochastic"], np.random.default_rng(seed + i + 999)) for i in range(int(eval_cfg["mc_rollouts"]))]
+                    planned = evaluate_plan(compiled, plan, td, start_s)
+                    plan.planned_cost = planned.total_cost
+                    plan.planned_distance_m = planned.total_distance_m
+                    plan.planned_time_s = planned.total_time_s
+                    outcomes = [
+                        simulate_plan(self.g, instance, plan, stoch_cfg, np.random.default_rng(seed + i + 999), compiled=compiled)
+                        for i in range(int(eval_cfg["mc_rollouts"]))
+                    ]
                     costs = [o.total_cost for o in outcomes]
                     times = [o.total_time_s for o in outcomes]
-                    lates = [v for o in outcomes for v in o.lateness_values_s]
+                    lates = np.concatenate([o.lateness_values_s for o in outcomes]) if outcomes else np.empty(0)
                     row = {
                         "instance_id": instance.instance_id,
                         "city": instance.city,
@@ -96,15 +144,30 @@ class BenchmarkRunner:
                         "feasibility_rate": float(np.mean([1.0 if o.feasible else 0.0 for o in outcomes])),
                         "cvr_mean": cvr(costs),
                         "cost_per_delivery": float(np.mean(costs)) / max(len(instance.customers), 1),
-                        "lateness_mean_s": float(np.mean(lates)) if lates else 0.0,
-                        "lateness_p95_s": float(np.percentile(lates, 95)) if lates else 0.0,
+                        "lateness_mean_s": float(np.mean(lates)) if lates.size else 0.0,
+                        "lateness_p95_s": float(np.percentile(lates, 95)) if lates.size else 0.0,
                     }
                     rows.append(row)
+                    # Solvers without a search loop contribute their single final point.
+                    trace = plan.meta.get("trace") or [(solve_time, 0, plan.planned_distance_m)]
+                    trace_rows.extend(
+                        {
+                            "instance_id": instance.instance_id,
+                            "n_customers": len(instance.customers),
+                            "solver": sname,
+                            "run_seed": seed,
+                            "elapsed_s": t,
+                            "evaluations": e,
+                            "cost": c,
+                        }
+                        for t, e, c in trace
+                    )
                     update_progress(
                         f"{progress_bar(job_idx, total_jobs)} [runner] job {job_idx}/{total_jobs} complete | "
                         f"inst={instance.instance_id} | solver={sname}"
                     )
         print()
+        self.traces = pd.DataFrame(trace_rows)
         df = pd.DataFrame(rows)
         summary = df.groupby(["instance_id", "solver"], as_index=False).mean(numeric_only=True)
         std_metrics = [
@@ -128,6 +191,8 @@ class BenchmarkRunner:
         data_cfg = self.cfg["data"]
         write_results(df, data_cfg["results_csv"])
         write_results(summary, data_cfg["summary_csv"])
+        if data_cfg.get("traces_csv"):
+            write_results(self.traces, data_cfg["traces_csv"])
         write_metadata(
             {
                 "timestamp": datetime.now(tz=timezone.utc).isoformat(),
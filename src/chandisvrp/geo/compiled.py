@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING, Iterable
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix
+
+if TYPE_CHECKING:
+    from chandisvrp.geo.nearest import NodeIndex
+
+
+@dataclass
+class CompiledGraph:
+    """Array form of the annotated road graph: sorted node ids, coordinates and CSR out-edges.
+
+    Parallel edges are collapsed, keeping the minimum of each weight independently.
+    """
+
+    node_ids: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    length_m: np.ndarray
+    base_time_s: np.ndarray
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.node_ids.shape[0])
+
+    @property
+    def n_edges(self) -> int:
+        return int(self.indices.shape[0])
+
+    def index_of(self, nodes: Iterable[int] | np.ndarray) -> np.ndarray:
+        ids = np.asarray(list(nodes) if not isinstance(nodes, np.ndarray) else nodes, dtype=np.int64)
+        pos = np.searchsorted(self.node_ids, ids)
+        pos = np.minimum(pos, self.n_nodes - 1)
+        if ids.size and not np.array_equal(self.node_ids[pos], ids):
+            missing = ids[self.node_ids[pos] != ids]
+            raise KeyError(f"nodes not in graph: {missing[:5].tolist()}")
+        return pos
+
+    def coords(self, node: int) -> tuple[float, float]:
+        i = int(self.index_of([node])[0])
+        return float(self.x[i]), float(self.y[i])
+
+    def neighbors(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i] : self.indptr[i + 1]]
+
+    def csgraph(self, weight: str = "length_m") -> csr_matrix:
+        data = getattr(self, weight)
+        return csr_matrix((data, self.indices, self.indptr), shape=(self.n_nodes, self.n_nodes))
+
+    def _arrays(self) -> tuple[np.ndarray, ...]:
+        return (self.node_ids, self.x, self.y, self.indptr, self.indices, self.length_m, self.base_time_s)
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(a.nbytes for a in self._arrays()))
+
+    @cached_property
+    def spatial_index(self) -> NodeIndex:
+        from chandisvrp.geo.nearest import NodeIndex
+
+        return NodeIndex(self.node_ids, self.x, self.y)
+
+    @cached_property
+    def digest(self) -> str:
+        h = hashlib.sha1()
+        for a in self._arrays():
+            h.update(np.ascontiguousarray(a).tobytes())
+        return h.hexdigest()
+
+
+def from_edge_arrays(
+    node_ids: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    u: np.ndarray,
+    v: np.ndarray,
+    length_m: np.ndarray,
+    base_time_s: np.ndarray,
+) -> CompiledGraph:
+    """Build a CompiledGraph from edge lists given as positions into ``node_ids``."""
+    order = np.argsort(node_ids, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    u, v = rank[u], rank[v]
+    n = int(node_ids.shape[0])
+    key = u.astype(np.int64) * n + v
+    uniq, inv = np.unique(key, return_inverse=True)
+    length = np.full(uniq.size, np.inf)
+    time_s = np.full(uniq.size, np.inf)
+    np.minimum.at(length, inv, length_m)
+    np.minimum.at(time_s, inv, base_time_s)
+    src = uniq // n
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return CompiledGraph(
+        node_ids=np.asarray(node_ids, dtype=np.int64)[order],
+        x=np.asarray(x, dtype=float)[order],
+        y=np.asarray(y, dtype=float)[order],
+        indptr=indptr,
+        indices=(uniq % n).astype(np.int32),
+        length_m=length,
+        base_time_s=time_s,
+    )
+
+
+def compile_graph(g: nx.MultiDiGraph) -> CompiledGraph:
+    node_ids = np.fromiter((int(n) for n in g.nodes()), dtype=np.int64, count=g.number_of_nodes())
+    pos = {int(n): i for i, n in enumerate(node_ids)}
+    x = np.fromiter((float(d.get("x", 0.0)) for _, d in g.nodes(data=True)), dtype=float, count=node_ids.size)
+    y = np.fromiter((float(d.get("y", 0.0)) for _, d in g.nodes(data=True)), dtype=float, count=node_ids.size)
+    m = g.number_of_edges()
+    u = np.empty(m, dtype=np.int64)
+    v = np.empty(m, dtype=np.int64)
+    length_m = np.empty(m, dtype=float)
+    base_time_s = np.empty(m, dtype=float)
+    for k, (a, b, data) in enumerate(g.edges(data=True)):
+        u[k] = pos[int(a)]
+        v[k] = pos[int(b)]
+        length_m[k] = float(data.get("length_m", data.get("length", 500.0)))
+        base_time_s[k] = float(data.get("base_time_s", 60.0))
+    return from_edge_arrays(node_ids, x, y, u, v, length_m, base_time_s)
+
+
+def as_compiled(g: nx.MultiDiGraph | CompiledGraph) -> CompiledGraph:
+    return g if isinstance(g, CompiledGraph) else compile_graph(g)
+
+
+def to_networkx(cg: CompiledGraph) -> nx.MultiDiGraph:
+    g = nx.MultiDiGraph()
+    ids = cg.node_ids.tolist()
+    g.add_nodes_from((n, {"x": x, "y": y}) for n, x, y in zip(ids, cg.x.tolist(), cg.y.tolist()))
+    src = np.repeat(np.arange(cg.n_nodes), np.diff(cg.indptr)).tolist()
+    speed = (cg.length_m / cg.base_time_s * 3.6).tolist()
+    g.add_edges_from(
+        (ids[u], ids[v], {"length": l, "speed_kph": s, "length_m": l, "base_speed_kph": s, "base_time_s": t})
+        for u, v, l, s, t in zip(src, cg.indices.tolist(), cg.length_m.tolist(), speed, cg.base_time_s.tolist())
+    )
+    return g
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from chandisvrp.geo.compiled import CompiledGraph, as_compiled
+from chandisvrp.geo.tiled_matrix import LazyQuantity, TiledMatrix
+from chandisvrp.types import Instance
+
+# Sources per Dijkstra call; bounds the (batch x graph nodes) scratch array.
+DIJKSTRA_BATCH = 256
+
+
+@dataclass
+class DistanceMatrix:
+    nodes: np.ndarray
+    length_m: np.ndarray | LazyQuantity
+    time_s: np.ndarray | LazyQuantity
+    index: dict[int, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not self.index:
+            self.index = {int(n): i for i, n in enumerate(self.nodes)}
+
+    def rows(self, nodes: Iterable[int]) -> np.ndarray:
+        return np.array([self.index[int(n)] for n in nodes], dtype=np.int64)
+
+
+def _unique_nodes(nodes: Iterable[int]) -> list[int]:
+    return list(dict.fromkeys(int(n) for n in nodes))
+
+
+def _fill_unreachable(arr: np.ndarray) -> np.ndarray:
+    # One-way streets can make u->v unreachable while v->u is not; borrow the reverse leg first,
+    # then charge anything still disconnected at twice the longest finite trip.
+    arr = np.where(np.isfinite(arr), arr, arr.T)
+    bad = ~np.isfinite(arr)
+    if bad.any():
+        finite = arr[~bad]
+        arr[bad] = 2.0 * float(finite.max()) if finite.size else 0.0
+    return arr
+
+
+def shortest_path_matrix(csgraph: csr_matrix, sources: np.ndarray, batch: int = DIJKSTRA_BATCH) -> np.ndarray:
+    out = np.empty((len(sources), len(sources)), dtype=float)
+    for lo in range(0, len(sources), batch):
+        dist = dijkstra(csgraph, directed=True, indices=sources[lo : lo + batch])
+        out[lo : lo + batch] = dist[:, sources]
+    return out
+
+
+def build_distance_matrix(g: nx.MultiDiGraph | CompiledGraph, nodes: Iterable[int]) -> DistanceMatrix:
+    cg = as_compiled(g)
+    order = _unique_nodes(nodes)
+    sources = cg.index_of(order)
+    length = shortest_path_matrix(cg.csgraph("length_m"), sources)
+    time_s = shortest_path_matrix(cg.csgraph("base_time_s"), sources)
+    return DistanceMatrix(
+        nodes=np.array(order, dtype=np.int64),
+        length_m=_fill_unreachable(length),
+        time_s=_fill_unreachable(time_s),
+    )
+
+
+def matrix_key(cg: CompiledGraph, nodes: Iterable[int]) -> str:
+    h = hashlib.sha1(cg.digest.encode())
+    h.update(np.array(sorted(_unique_nodes(nodes)), dtype=np.int64).tobytes())
+    return h.hexdigest()
+
+
+def save_matrix(matrix: DistanceMatrix, path: str | Path) -> None:
+    # Write into a scratch directory and rename so concurrent runs never see half a matrix.
+    target = Path(path)
+    tmp = target.with_name(f"{target.name}.{uuid.uuid4().hex}.tmp")
+    tmp.mkdir(parents=True)
+    for name in ("nodes", "length_m", "time_s"):
+        np.save(tmp / f"{name}.npy", getattr(matrix, name))
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_matrix(path: str | Path) -> DistanceMatrix:
+    p = Path(path)
+    return DistanceMatrix(
+        nodes=np.load(p / "nodes.npy"),
+        length_m=np.load(p / "length_m.npy", mmap_mode="r"),
+        time_s=np.load(p / "time_s.npy", mmap_mode="r"),
+    )
+
+
+def tiled_distance_matrix(cg: CompiledGraph, nodes: Iterable[int], path: str | Path, tile_rows: int = 64, hot_rows: int = 1024) -> DistanceMatrix:
+    tm = TiledMatrix(cg, nodes, path, tile_rows=tile_rows, hot_rows=hot_rows)
+    return DistanceMatrix(nodes=tm.nodes, length_m=tm.quantity("length_m"), time_s=tm.quantity("time_s"))
+
+
+def load_or_build_matrix(
+    g: nx.MultiDiGraph | CompiledGraph,
+    nodes: Iterable[int],
+    cache_dir: str | Path | None = None,
+    matrix_cfg: dict | None = None,
+) -> DistanceMatrix:
+    nodes = list(nodes)
+    mcfg = matrix_cfg or {}
+    tiled_min = mcfg.get("tiled_min_nodes")
+    large = tiled_min is not None and len(_unique_nodes(nodes)) >= int(tiled_min)
+    if cache_dir is None and not large:
+        return build_distance_matrix(g, nodes)
+    cg = as_compiled(g)
+    if large:
+        root = Path(cache_dir) if cache_dir is not None else Path(tempfile.gettempdir()) / "chandisvrp-matrices"
+        return tiled_distance_matrix(
+            cg,
+            nodes,
+            root / f"{matrix_key(cg, nodes)}-tiled",
+            tile_rows=int(mcfg.get("tile_rows", 64)),
+            hot_rows=int(mcfg.get("hot_rows", 1024)),
+        )
+    path = Path(cache_dir) / matrix_key(cg, nodes)
+    if (path / "time_s.npy").exists():
+        return load_matrix(path)
+    matrix = build_distance_matrix(cg, nodes)
+    save_matrix(matrix, path)
+    return matrix
+
+
+def instance_nodes(instance: Instance) -> list[int]:
+    return [instance.depot_node] + [c.node for c in instance.customers]
+
+
+def instance_matrix(
+    g: nx.MultiDiGraph | CompiledGraph,
+    instance: Instance,
+    cache_dir: str | Path | None = None,
+    matrix_cfg: dict | None = None,
+) -> DistanceMatrix:
+    return load_or_build_matrix(g, instance_nodes(instance), cache_dir, matrix_cfg)
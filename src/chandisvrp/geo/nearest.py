@@ -1,19 +1,68 @@
 from __future__ import annotations
 
+import hashlib
 import math
+import weakref
 
 import networkx as nx
+import numpy as np
+from scipy.spatial import cKDTree
 
+from chandisvrp.geo.compiled import CompiledGraph
 
-def nearest_node(g: nx.MultiDiGraph, x: float, y: float) -> int:
-    best = None
-    best_d = float("inf")
-    for n, data in g.nodes(data=True):
-        dx = float(data.get("x", 0.0)) - x
-        dy = float(data.get("y", 0.0)) - y
-        d = math.hypot(dx, dy)
-        if d < best_d:
-            best_d = d
-            best = n
-    assert best is not None
-    return int(best)
+_M_PER_DEG_LAT = 110_574.0
+_M_PER_DEG_LON_EQ = 111_320.0
+# One index per networkx graph object, dropped with the graph; compiled graphs cache their own.
+_GRAPH_INDEX: weakref.WeakKeyDictionary[nx.MultiDiGraph, tuple[str, NodeIndex]] = weakref.WeakKeyDictionary()
+
+
+def _is_lonlat(x: np.ndarray, y: np.ndarray) -> bool:
+    # Same heuristic as the map renderer: OSM graphs carry lon/lat, the synthetic grid carries meters.
+    return bool(x.size) and bool(np.all(np.abs(y) <= 90) and np.all(np.abs(x) <= 180))
+
+
+class NodeIndex:
+    def __init__(self, node_ids: np.ndarray, x: np.ndarray, y: np.ndarray):
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.geographic = _is_lonlat(x, y)
+        # Local equirectangular projection keeps KD-tree distances in meters at city scale.
+        self._lon_scale = _M_PER_DEG_LON_EQ * math.cos(math.radians(float(y.mean()))) if self.geographic else 1.0
+        self._lat_scale = _M_PER_DEG_LAT if self.geographic else 1.0
+        self._tree = cKDTree(self._project(x, y))
+
+    @classmethod
+    def from_graph(cls, g: nx.MultiDiGraph | CompiledGraph) -> NodeIndex:
+        if isinstance(g, CompiledGraph):
+            return g.spatial_index
+        ids = np.fromiter((int(n) for n in g.nodes()), dtype=np.int64, count=g.number_of_nodes())
+        x = np.fromiter((float(d.get("x", 0.0)) for _, d in g.nodes(data=True)), dtype=float, count=ids.size)
+        y = np.fromiter((float(d.get("y", 0.0)) for _, d in g.nodes(data=True)), dtype=float, count=ids.size)
+        # Keyed on the node ids and coordinates, so any edit to them rebuilds the tree.
+        h = hashlib.sha1()
+        for a in (ids, x, y):
+            h.update(a.tobytes())
+        key = h.hexdigest()
+        hit = _GRAPH_INDEX.get(g)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        index = cls(ids, x, y)
+        _GRAPH_INDEX[g] = (key, index)
+        return index
+
+    def _project(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return np.column_stack([np.asarray(x, dtype=float) * self._lon_scale, np.asarray(y, dtype=float) * self._lat_scale])
+
+    def query(self, xs: np.ndarray, ys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        dist, pos = self._tree.query(self._project(np.atleast_1d(xs), np.atleast_1d(ys)), workers=-1)
+        return self.node_ids[pos], dist
+
+
+def nearest_nodes(g: nx.MultiDiGraph | CompiledGraph | NodeIndex, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    index = g if isinstance(g, NodeIndex) else NodeIndex.from_graph(g)
+    return index.query(xs, ys)[0]
+
+
+def nearest_node(g: nx.MultiDiGraph | CompiledGraph | NodeIndex, x: float, y: float) -> int:
+    return int(nearest_nodes(g, np.array([x]), np.array([y]))[0])
@@ -1,9 +1,22 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import os
+import uuid
 from pathlib import Path
 
 import networkx as nx
+import numpy as np
+
+from chandisvrp.geo.compiled import (
+    CompiledGraph,
+    compile_graph,
+    from_edge_arrays,
+    to_networkx,
+)
+from chandisvrp.geo.synthetic import generate_road_network
 
 logger = logging.getLogger(__name__)
 
@@ -33,16 +46,111 @@ def build_synthetic_graph(grid_w: int = 8, grid_h: int = 8, spacing_m: float = 5
     return _annotate_graph(mg)
 
 
-def load_or_build_graph(place: str, path: str | Path, use_osm: bool = True, synthetic_cfg: dict | None = None) -> nx.MultiDiGraph:
+def snapshot_path(path: str | Path) -> Path:
+    return Path(path).with_suffix(".snapshot.npz")
+
+
+def _file_sha1(path: Path) -> str:
+    h = hashlib.sha1()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def save_graph_snapshot(g: nx.MultiDiGraph, path: str | Path, source_sha1: str) -> None:
+    # Only the attributes the benchmark reads survive: node x/y and the numeric edge annotations.
+    nodes = list(g.nodes())
+    pos = {n: i for i, n in enumerate(nodes)}
+    edges = list(g.edges(keys=True, data=True))
+
+    def edge_col(name: str, default: float) -> np.ndarray:
+        return np.array([float(d.get(name, default)) for _, _, _, d in edges], dtype=float)
+
+    target = snapshot_path(path)
+    # A unique scratch name so concurrent writers never clobber each other's half-written file.
+    tmp = target.with_name(f"{target.name}.{uuid.uuid4().hex}.tmp.npz")
+    try:
+        np.savez(
+            tmp,
+            source_sha1=np.array(source_sha1),
+            graph_attrs=np.array(json.dumps(g.graph, default=str)),
+            node_ids=np.array(nodes, dtype=np.int64),
+            x=np.array([float(g.nodes[n].get("x", 0.0)) for n in nodes], dtype=float),
+            y=np.array([float(g.nodes[n].get("y", 0.0)) for n in nodes], dtype=float),
+            u=np.array([pos[u] for u, _, _, _ in edges], dtype=np.int64),
+            v=np.array([pos[v] for _, v, _, _ in edges], dtype=np.int64),
+            key=np.array([int(k) for _, _, k, _ in edges], dtype=np.int64),
+            length=edge_col("length", 500.0),
+            speed_kph=edge_col("speed_kph", 30.0),
+            length_m=edge_col("length_m", 500.0),
+            base_speed_kph=edge_col("base_speed_kph", 30.0),
+            base_time_s=edge_col("base_time_s", 60.0),
+        )
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _try_save_snapshot(g: nx.MultiDiGraph, path: Path, source_sha1: str) -> None:
+    # The snapshot only speeds up the next load; failing to write it must not discard the graph.
+    try:
+        save_graph_snapshot(g, path, source_sha1)
+    except Exception:
+        logger.warning("Could not write graph snapshot for %s", path, exc_info=True)
+
+
+def _read_snapshot(path: Path, source_sha1: str) -> dict[str, np.ndarray] | None:
+    snap = snapshot_path(path)
+    if not snap.exists():
+        return None
+    try:
+        with np.load(snap) as data:
+            arrays = {k: data[k] for k in data.files}
+    except Exception:
+        logger.exception("Failed reading graph snapshot %s", snap)
+        return None
+    if str(arrays["source_sha1"]) != source_sha1:
+        logger.info("Graph snapshot %s is stale; rebuilding from GraphML", snap)
+        return None
+    return arrays
+
+
+def _graph_from_snapshot(a: dict[str, np.ndarray]) -> nx.MultiDiGraph:
+    g = nx.MultiDiGraph(**json.loads(str(a["graph_attrs"])))
+    ids = a["node_ids"].tolist()
+    g.add_nodes_from((n, {"x": x, "y": y}) for n, x, y in zip(ids, a["x"].tolist(), a["y"].tolist()))
+    cols = ("length", "speed_kph", "length_m", "base_speed_kph", "base_time_s")
+    values = zip(*(a[c].tolist() for c in cols))
+    g.add_edges_from(
+        (ids[u], ids[v], k, dict(zip(cols, vals)))
+        for u, v, k, vals in zip(a["u"].tolist(), a["v"].tolist(), a["key"].tolist(), values)
+    )
+    return g
+
+
+def _compiled_from_snapshot(a: dict[str, np.ndarray]) -> CompiledGraph:
+    return from_edge_arrays(a["node_ids"], a["x"], a["y"], a["u"], a["v"], a["length_m"], a["base_time_s"])
+
+
+def _load_or_build(
+    place: str, path: str | Path, use_osm: bool, synthetic_cfg: dict | None
+) -> tuple[nx.MultiDiGraph, CompiledGraph | None]:
     target = Path(path)
     if target.exists():
+        source_sha1 = _file_sha1(target)
+        snap = _read_snapshot(target, source_sha1)
+        if snap is not None:
+            return _graph_from_snapshot(snap), _compiled_from_snapshot(snap)
         try:
             import osmnx as ox
 
-            g = ox.load_graphml(target)
-            return _annotate_graph(g)
+            g = _annotate_graph(ox.load_graphml(target))
         except Exception:
             logger.exception("Failed reading graphml; fallback synthetic")
+        else:
+            _try_save_snapshot(g, target, source_sha1)
+            return g, None
     if use_osm:
         try:
             import osmnx as ox
@@ -52,12 +160,39 @@ def load_or_build_graph(place: str, path: str | Path, use_osm: bool = True, synt
             g = _annotate_graph(g)
             target.parent.mkdir(parents=True, exist_ok=True)
             ox.save_graphml(g, target)
-            return g
         except Exception:
             logger.exception("OSM download failed; using synthetic fallback")
+        else:
+            _try_save_snapshot(g, target, _file_sha1(target))
+            return g, None
     cfg = synthetic_cfg or {}
-    return build_synthetic_graph(
+    if any(float(cfg.get(k, 0)) > 0 for k in ("arterial_every", "drop_prob", "one_way_prob")):
+        cg = generate_road_network(
+            grid_w=int(cfg.get("grid_w", 8)),
+            grid_h=int(cfg.get("grid_h", 8)),
+            spacing_m=float(cfg.get("spacing_m", 500.0)),
+            rng=np.random.default_rng(int(cfg.get("seed", 0))),
+            street_speed_kph=float(cfg.get("street_speed_kph", 32.0)),
+            arterial_every=int(cfg.get("arterial_every", 0)),
+            arterial_speed_kph=float(cfg.get("arterial_speed_kph", 50.0)),
+            drop_prob=float(cfg.get("drop_prob", 0.0)),
+            one_way_prob=float(cfg.get("one_way_prob", 0.0)),
+        )
+        return to_networkx(cg), cg
+    g = build_synthetic_graph(
         grid_w=int(cfg.get("grid_w", 8)),
         grid_h=int(cfg.get("grid_h", 8)),
         spacing_m=float(cfg.get("spacing_m", 500.0)),
     )
+    return g, None
+
+
+def load_or_build_graph(place: str, path: str | Path, use_osm: bool = True, synthetic_cfg: dict | None = None) -> nx.MultiDiGraph:
+    return _load_or_build(place, path, use_osm, synthetic_cfg)[0]
+
+
+def load_compiled_graph(
+    place: str, path: str | Path, use_osm: bool = True, synthetic_cfg: dict | None = None
+) -> tuple[nx.MultiDiGraph, CompiledGraph]:
+    g, cg = _load_or_build(place, path, use_osm, synthetic_cfg)
+    return g, cg if cg is not None else compile_graph(g)
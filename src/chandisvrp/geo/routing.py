@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import heapq
+import math
+
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+from chandisvrp.geo.compiled import CompiledGraph
+
+
+class RouteQueryEngine:
+    """Point-to-point shortest paths with ALT (A*, landmarks, triangle inequality), searched bidirectionally.
+
+    Landmark distances are precomputed once per graph; each query then only settles the nodes
+    whose lower bounds keep them on a plausible s-t corridor.
+    """
+
+    def __init__(self, cg: CompiledGraph, n_landmarks: int = 8, weight: str = "length_m"):
+        self.cg = cg
+        self.weight = weight
+        cs = cg.csgraph(weight)
+        rev = cs.T.tocsr()
+        self._fwd = (cs.indptr.tolist(), cs.indices.tolist(), cs.data.tolist())
+        self._bwd = (rev.indptr.tolist(), rev.indices.tolist(), rev.data.tolist())
+        self.landmarks = self._pick_landmarks(cs, rev, n_landmarks)
+        with np.errstate(invalid="ignore"):
+            self._from_l = dijkstra(cs, directed=True, indices=self.landmarks)
+            self._to_l = dijkstra(rev, directed=True, indices=self.landmarks)
+
+    def _pick_landmarks(self, cs, rev, k: int) -> np.ndarray:
+        # Farthest-point selection on round-trip distance spreads landmarks to the periphery.
+        n = self.cg.n_nodes
+        k = max(1, min(k, n))
+        chosen: list[int] = []
+        closest = np.full(n, np.inf)
+        cur = int(np.argmax(np.hypot(self.cg.x - self.cg.x.mean(), self.cg.y - self.cg.y.mean())))
+        for _ in range(k):
+            chosen.append(cur)
+            d = dijkstra(cs, directed=True, indices=cur) + dijkstra(rev, directed=True, indices=cur)
+            closest = np.minimum(closest, np.where(np.isfinite(d), d, -1.0))
+            closest[chosen] = -1.0
+            cur = int(np.argmax(closest))
+            if closest[cur] <= 0:
+                break
+        return np.array(chosen, dtype=np.int64)
+
+    def _potential(self, s: int, t: int) -> np.ndarray:
+        # Average of the forward and backward landmark bounds keeps both searches consistent.
+        f, b = self._from_l, self._to_l
+        with np.errstate(invalid="ignore"):
+            to_t = np.fmax(f[:, [t]] - f, b - b[:, [t]]).max(axis=0)
+            from_s = np.fmax(f - f[:, [s]], b[:, [s]] - b).max(axis=0)
+        to_t = np.maximum(np.nan_to_num(to_t, nan=0.0, posinf=np.inf, neginf=0.0), 0.0)
+        from_s = np.maximum(np.nan_to_num(from_s, nan=0.0, posinf=np.inf, neginf=0.0), 0.0)
+        return 0.5 * (to_t - from_s)
+
+    def query_index(self, s: int, t: int) -> tuple[float, list[int]]:
+        if s == t:
+            return 0.0, [s]
+        pot = self._potential(s, t).tolist()
+        if not math.isfinite(pot[s]) or not math.isfinite(pot[t]):
+            return math.inf, []
+        dist = ({s: 0.0}, {t: 0.0})
+        parent: tuple[dict[int, int], dict[int, int]] = ({s: -1}, {t: -1})
+        heaps = ([(pot[s], s)], [(-pot[t], t)])
+        done: tuple[set[int], set[int]] = (set(), set())
+        graphs = (self._fwd, self._bwd)
+        sign = (1.0, -1.0)
+        best, meet = math.inf, -1
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            _, u = heapq.heappop(heaps[side])
+            if u in done[side]:
+                continue
+            done[side].add(u)
+            du = dist[side][u]
+            other = dist[1 - side]
+            if u in other and du + other[u] < best:
+                best, meet = du + other[u], u
+            indptr, indices, data = graphs[side]
+            d_side, p_side, h_side = dist[side], parent[side], heaps[side]
+            for e in range(indptr[u], indptr[u + 1]):
+                v = indices[e]
+                pv = pot[v]
+                if not math.isfinite(pv):
+                    continue
+                nd = du + data[e]
+                if nd < d_side.get(v, math.inf):
+                    d_side[v] = nd
+                    p_side[v] = u
+                    heapq.heappush(h_side, (nd + sign[side] * pv, v))
+                    if v in other and nd + other[v] < best:
+                        best, meet = nd + other[v], v
+        if meet < 0:
+            return math.inf, []
+        path: list[int] = []
+        v = meet
+        while v != -1:
+            path.append(v)
+            v = parent[0][v]
+        path.reverse()
+        v = parent[1][meet]
+        while v != -1:
+            path.append(v)
+            v = parent[1][v]
+        return best, path
+
+    def query(self, u: int, v: int) -> tuple[float, list[int]]:
+        s, t = self.cg.index_of([u, v]).tolist()
+        d, path = self.query_index(s, t)
+        return d, self.cg.node_ids[path].tolist() if path else []
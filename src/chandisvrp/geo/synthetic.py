@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import numpy as np
+
+from chandisvrp.geo.compiled import CompiledGraph, from_edge_arrays
+
+
+def generate_road_network(
+    grid_w: int,
+    grid_h: int,
+    spacing_m: float = 500.0,
+    rng: np.random.Generator | None = None,
+    street_speed_kph: float = 32.0,
+    arterial_every: int = 0,
+    arterial_speed_kph: float = 50.0,
+    drop_prob: float = 0.0,
+    one_way_prob: float = 0.0,
+) -> CompiledGraph:
+    """Grid city built entirely with array ops; node ``i`` sits at column ``i % grid_w``, row ``i // grid_w``.
+
+    Every ``arterial_every``-th row and column is an arterial: always kept, always two-way and
+    faster. Other streets are deleted with ``drop_prob`` and made one-way with ``one_way_prob``.
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    n = grid_w * grid_h
+    ids = np.arange(n, dtype=np.int64)
+    col, row = ids % grid_w, ids // grid_w
+
+    h_src = ids[col < grid_w - 1]
+    v_src = ids[row < grid_h - 1]
+    u = np.concatenate([h_src, v_src])
+    v = np.concatenate([h_src + 1, v_src + grid_w])
+    if arterial_every > 0:
+        arterial = np.concatenate([row[h_src] % arterial_every == 0, col[v_src] % arterial_every == 0])
+    else:
+        arterial = np.zeros(u.size, dtype=bool)
+
+    keep = arterial | (rng.random(u.size) >= drop_prob)
+    u, v, arterial = u[keep], v[keep], arterial[keep]
+    one_way = ~arterial & (rng.random(u.size) < one_way_prob)
+    flip = one_way & (rng.random(u.size) < 0.5)
+    u, v = np.where(flip, v, u), np.where(flip, u, v)
+
+    src = np.concatenate([u, v[~one_way]])
+    dst = np.concatenate([v, u[~one_way]])
+    speed = np.where(np.concatenate([arterial, arterial[~one_way]]), arterial_speed_kph, street_speed_kph)
+    length = np.full(src.size, float(spacing_m))
+    base_time = np.maximum(1.0, length / (speed * 1000 / 3600))
+    return from_edge_arrays(ids, col * float(spacing_m), row * float(spacing_m), src, dst, length, base_time)
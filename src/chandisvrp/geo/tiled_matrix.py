@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+import shutil
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from scipy.sparse.csgraph import dijkstra
+
+from chandisvrp.geo.compiled import CompiledGraph
+
+QUANTITIES = ("length_m", "time_s")
+
+
+class LazyQuantity:
+    """Read-only 2-D view over one quantity of a TiledMatrix; indexes like an ndarray."""
+
+    def __init__(self, owner: TiledMatrix, name: str):
+        self._owner = owner
+        self._name = name
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        n = self._owner.n
+        return n, n
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.float32)
+
+    def __len__(self) -> int:
+        return self._owner.n
+
+    def file(self, rows: np.ndarray) -> Path:
+        """The backing .npy file, with every tile holding one of ``rows`` filled."""
+        self._owner.fill_rows(rows)
+        return self._owner.path / f"{self._name}.npy"
+
+    def __getitem__(self, key: Any) -> Any:
+        r, c = key if isinstance(key, tuple) else (key, slice(None))
+        if isinstance(r, slice):
+            r = np.arange(self._owner.n)[r]
+        if np.ndim(r) == 0:
+            return self._owner.row(self._name, int(r))[c]
+        r = np.asarray(r)
+        uniq, inv = np.unique(r, return_inverse=True)
+        block = np.stack([self._owner.row(self._name, int(u)) for u in uniq])
+        return block[inv.reshape(r.shape), c]
+
+
+class TiledMatrix:
+    """Float32 distance/time matrix in memory-mapped .npy files, filled one tile of rows at a time.
+
+    Tiles are computed on first touch and written back, so processes opening the same directory
+    share both the work and the page cache. A bounded LRU keeps hot rows in process memory.
+    """
+
+    def __init__(self, cg: CompiledGraph, nodes: Iterable[int], path: str | Path, tile_rows: int = 64, hot_rows: int = 1024):
+        self.cg = cg
+        self.nodes = np.array(list(dict.fromkeys(int(n) for n in nodes)), dtype=np.int64)
+        self.n = int(self.nodes.size)
+        self.path = Path(path)
+        self.tile_rows = int(tile_rows)
+        self.hot_rows = int(hot_rows)
+        self._create()
+        # The cache is keyed on the node set; rows follow whichever order created the entry.
+        self.nodes = np.load(self.path / "nodes.npy")
+        self._cols = cg.index_of(self.nodes)
+        self._hot: OrderedDict[tuple[str, int], np.ndarray] = OrderedDict()
+        self._csgraph = {"length_m": cg.csgraph("length_m"), "time_s": cg.csgraph("base_time_s")}
+        self._penalty: dict[str, float] = {}
+        self._files = {q: open_memmap(self.path / f"{q}.npy", mode="r+") for q in QUANTITIES}
+        self._done = open_memmap(self.path / "done.npy", mode="r+")
+
+    def _create(self) -> None:
+        if (self.path / "done.npy").exists():
+            return
+        tmp = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.mkdir(parents=True)
+        np.save(tmp / "nodes.npy", self.nodes)
+        for q in QUANTITIES:
+            open_memmap(tmp / f"{q}.npy", mode="w+", dtype=np.float32, shape=(self.n, self.n)).flush()
+        n_tiles = -(-self.n // self.tile_rows)
+        open_memmap(tmp / "done.npy", mode="w+", dtype=np.uint8, shape=(n_tiles,)).flush()
+        try:
+            os.replace(tmp, self.path)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def _fill_tile(self, t: int) -> None:
+        lo, hi = t * self.tile_rows, min(self.n, (t + 1) * self.tile_rows)
+        sources = self._cols[lo:hi]
+        for q in QUANTITIES:
+            block = dijkstra(self._csgraph[q], directed=True, indices=sources)[:, self._cols]
+            bad = ~np.isfinite(block)
+            if bad.any():
+                # Same policy as the dense matrix: reverse leg first, then a 2x penalty.
+                rev = dijkstra(self._csgraph[q].T.tocsr(), directed=True, indices=sources)[:, self._cols]
+                block = np.where(bad, rev, block)
+                block[~np.isfinite(block)] = self.penalty(q)
+            self._files[q][lo:hi] = block.astype(np.float32)
+            self._files[q].flush()
+        self._done[t] = 1
+        self._done.flush()
+
+    def fill_rows(self, rows: np.ndarray) -> None:
+        for t in np.unique(np.asarray(rows, dtype=np.int64) // self.tile_rows).tolist():
+            if not self._done[t]:
+                self._fill_tile(t)
+
+    def penalty(self, q: str) -> float:
+        """Twice the longest finite trip over the whole matrix, as the dense matrix charges.
+
+        Needs every row once, so it is computed only when a tile has a disconnected pair and is
+        then stored next to the tiles for other processes.
+        """
+        if q not in self._penalty:
+            f = self.path / f"penalty_{q}.npy"
+            if f.exists():
+                self._penalty[q] = float(np.load(f))
+            else:
+                longest = 0.0
+                for lo in range(0, self.n, self.tile_rows):
+                    block = dijkstra(self._csgraph[q], directed=True, indices=self._cols[lo : lo + self.tile_rows])[:, self._cols]
+                    finite = block[np.isfinite(block)]
+                    if finite.size:
+                        longest = max(longest, float(finite.max()))
+                self._penalty[q] = 2.0 * longest
+                tmp = self.path / f"penalty_{q}.{uuid.uuid4().hex}.npy"
+                np.save(tmp, np.float64(self._penalty[q]))
+                os.replace(tmp, f)
+        return self._penalty[q]
+
+    def row(self, name: str, i: int) -> np.ndarray:
+        key = (name, i)
+        hit = self._hot.get(key)
+        if hit is not None:
+            self._hot.move_to_end(key)
+            return hit
+        t = i // self.tile_rows
+        if not self._done[t]:
+            self._fill_tile(t)
+        out = np.array(self._files[name][i])
+        self._hot[key] = out
+        if len(self._hot) > self.hot_rows:
+            self._hot.popitem(last=False)
+        return out
+
+    def quantity(self, name: str) -> LazyQuantity:
+        return LazyQuantity(self, name)
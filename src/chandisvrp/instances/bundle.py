@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from chandisvrp.instances.serialization import save_instance
+from chandisvrp.types import Customer, Instance
+
+# Layout: magic | uint64 header length | JSON header | 64-byte aligned raw little-endian columns.
+MAGIC = b"CHSVRPB1"
+ALIGN = 64
+KINDS = ("residential", "commercial")
+COLUMNS = {
+    "customer_id": "<i8",
+    "node": "<i8",
+    "demand": "<i8",
+    "service_time_s": "<f8",
+    "tw_start_s": "<f8",
+    "tw_end_s": "<f8",
+    "kind": "u1",
+}
+META_FIELDS = ("schema_version", "instance_id", "city", "depot_node", "n_vehicles", "vehicle_capacity")
+
+
+def _pad(n: int) -> int:
+    return -n % ALIGN
+
+
+def save_bundle(instances: Iterable[Instance], path: str | Path) -> Path:
+    instances = list(instances)
+    kinds = list(KINDS) + sorted({c.kind for inst in instances for c in inst.customers} - set(KINDS))
+    kind_code = {k: i for i, k in enumerate(kinds)}
+    entries = []
+    start = 0
+    for inst in instances:
+        entry = {f: getattr(inst, f) for f in META_FIELDS}
+        entry.update(start=start, stop=start + len(inst.customers))
+        entries.append(entry)
+        start += len(inst.customers)
+    customers = [c for inst in instances for c in inst.customers]
+    cols = {
+        name: np.array(
+            [kind_code[c.kind] for c in customers] if name == "kind" else [getattr(c, name) for c in customers],
+            dtype=dtype,
+        )
+        for name, dtype in COLUMNS.items()
+    }
+
+    def header_bytes(offset0: int) -> bytes:
+        offsets, off = {}, offset0
+        for name, arr in cols.items():
+            offsets[name] = {"dtype": COLUMNS[name], "offset": off, "length": int(arr.size)}
+            off += arr.nbytes + _pad(arr.nbytes)
+        return json.dumps({"version": 1, "kinds": kinds, "columns": offsets, "instances": entries}).encode()
+
+    # Column offsets depend on the header size, so settle the header length before writing.
+    prefix = len(MAGIC) + 8
+    header = header_bytes(0)
+    while True:
+        data_start = prefix + len(header) + _pad(prefix + len(header))
+        candidate = header_bytes(data_start)
+        if len(candidate) == len(header):
+            header = candidate
+            break
+        header = candidate
+
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    # A unique scratch name so concurrent writers never clobber each other's half-written file.
+    tmp = p.with_name(f"{p.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with tmp.open("wb") as fh:
+            fh.write(MAGIC)
+            fh.write(np.uint64(len(header)).tobytes())
+            fh.write(header)
+            fh.write(b"\0" * _pad(prefix + len(header)))
+            for arr in cols.values():
+                fh.write(arr.tobytes())
+                fh.write(b"\0" * _pad(arr.nbytes))
+        os.replace(tmp, p)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return p
+
+
+class InstanceBundle:
+    """Read-only, memory-mapped view of a bundle; columns are zero-copy slices of the file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._raw = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if bytes(self._raw[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{self.path} is not an instance bundle")
+        hlen = int(self._raw[len(MAGIC) : len(MAGIC) + 8].view("<u8")[0])
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(self._raw[start : start + hlen]).decode())
+        self.kinds: list[str] = header["kinds"]
+        self.columns = {
+            name: self._raw[spec["offset"] : spec["offset"] + spec["length"] * np.dtype(spec["dtype"]).itemsize].view(spec["dtype"])
+            for name, spec in header["columns"].items()
+        }
+        self._entries: list[dict] = header["instances"]
+        self._by_id = {e["instance_id"]: i for i, e in enumerate(self._entries)}
+
+    @property
+    def ids(self) -> list[str]:
+        return [e["instance_id"] for e in self._entries]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, instance_id: object) -> bool:
+        return instance_id in self._by_id
+
+    def _entry(self, key: int | str) -> dict:
+        return self._entries[self._by_id[key] if isinstance(key, str) else key]
+
+    def arrays(self, key: int | str) -> dict[str, np.ndarray]:
+        e = self._entry(key)
+        return {name: col[e["start"] : e["stop"]] for name, col in self.columns.items()}
+
+    def __getitem__(self, key: int | str) -> Instance:
+        e = self._entry(key)
+        a = self.arrays(key)
+        customers = [
+            Customer(cid, node, dem, svc, tws, twe, self.kinds[k])
+            for cid, node, dem, svc, tws, twe, k in zip(
+                *(a[name].tolist() for name in COLUMNS),
+            )
+        ]
+        return Instance(customers=customers, **{f: e[f] for f in META_FIELDS})
+
+    def __iter__(self) -> Iterator[Instance]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def export_json(self, out_dir: str | Path) -> list[Path]:
+        out = Path(out_dir)
+        paths = []
+        for inst in self:
+            p = out / f"{inst.instance_id}.json"
+            save_instance(inst, p)
+            paths.append(p)
+        return paths
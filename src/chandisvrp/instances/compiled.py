@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING, Iterable
+
+import networkx as nx
+import numpy as np
+
+from chandisvrp.geo.compiled import CompiledGraph
+from chandisvrp.geo.matrix import DistanceMatrix, instance_matrix, instance_nodes
+from chandisvrp.types import Instance
+
+if TYPE_CHECKING:
+    from chandisvrp.solvers.route_cache import RouteCostCache
+
+
+@dataclass
+class CompiledInstance:
+    """Array view of an Instance, indexed by dense point: 0 is the depot, ``k`` the k-th customer.
+
+    Per-point arrays carry neutral depot values (zero demand and service, an always-open window),
+    so route code never has to special-case point 0.
+    """
+
+    instance: Instance
+    matrix: DistanceMatrix
+    customer_ids: np.ndarray
+    demand: np.ndarray
+    service_s: np.ndarray
+    tw_start_s: np.ndarray
+    tw_end_s: np.ndarray
+    rows: np.ndarray
+    point_of: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def n_customers(self) -> int:
+        return int(self.customer_ids.size) - 1
+
+    @property
+    def capacity(self) -> int:
+        return int(self.instance.vehicle_capacity)
+
+    @cached_property
+    def length_m(self) -> np.ndarray:
+        return self._point_view(self.matrix.length_m)
+
+    @cached_property
+    def time_s(self) -> np.ndarray:
+        return self._point_view(self.matrix.time_s)
+
+    @cached_property
+    def route_cache(self) -> RouteCostCache:
+        """The one ``RouteCostCache`` of this instance, so every solver and stage reuses its prices."""
+        from chandisvrp.solvers.route_cache import RouteCostCache
+
+        return RouteCostCache(self.length_m)
+
+    def _point_view(self, arr):
+        # The matrix is normally built in instance point order, which makes this a zero-copy view.
+        if self.rows.size == getattr(arr, "shape", (0,))[0] and np.array_equal(self.rows, np.arange(self.rows.size)):
+            return arr
+        return np.asarray(arr[np.ix_(self.rows, self.rows)])
+
+    def points(self, customer_ids: Iterable[int]) -> list[int]:
+        return [self.point_of[cid] for cid in customer_ids]
+
+    def ids(self, points: Iterable[int]) -> list[int]:
+        ids = self.customer_ids
+        return [int(ids[p]) for p in points]
+
+    def to_point_routes(self, routes: list[list[int]]) -> list[list[int]]:
+        return [self.points(r) for r in routes]
+
+    def to_id_routes(self, routes: list[list[int]]) -> list[list[int]]:
+        return [self.ids(r) for r in routes]
+
+
+def compile_instance(instance: Instance, matrix: DistanceMatrix) -> CompiledInstance:
+    cs = instance.customers
+    n = len(cs)
+
+    def col(values: list[float], depot_value: float, dtype: type) -> np.ndarray:
+        return np.array([depot_value, *values], dtype=dtype)
+
+    return CompiledInstance(
+        instance=instance,
+        matrix=matrix,
+        customer_ids=col([c.customer_id for c in cs], -1, np.int64),
+        demand=col([c.demand for c in cs], 0, np.int64),
+        service_s=col([c.service_time_s for c in cs], 0.0, float),
+        tw_start_s=col([c.tw_start_s for c in cs], 0.0, float),
+        tw_end_s=col([c.tw_end_s for c in cs], np.inf, float),
+        rows=matrix.rows(instance_nodes(instance)),
+        point_of={c.customer_id: k for k, c in enumerate(cs, start=1)} if n else {},
+    )
+
+
+def ensure_compiled(
+    g: nx.MultiDiGraph | CompiledGraph, instance: Instance, compiled: CompiledInstance | None = None
+) -> CompiledInstance:
+    if compiled is not None:
+        return compiled
+    return compile_instance(instance, instance_matrix(g, instance))
@@ -5,3 +5,7 @@ import numpy as np
 
 def sample_demand(rng: np.random.Generator, lam: float, min_v: int, max_v: int) -> int:
     return int(np.clip(rng.poisson(lam=lam), min_v, max_v))
+
+
+def sample_demands(rng: np.random.Generator, lam: float, min_v: int, max_v: int, size: int) -> np.ndarray:
+    return np.clip(rng.poisson(lam=lam, size=size), min_v, max_v).astype(np.int64)
@@ -1,16 +1,56 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
 import networkx as nx
 import numpy as np
 
 from chandisvrp.geo.nearest import nearest_node
-from chandisvrp.instances.demand import sample_demand
-from chandisvrp.instances.time_windows import sample_time_window
+from chandisvrp.instances.demand import sample_demands
+from chandisvrp.instances.time_windows import sample_time_windows
 from chandisvrp.types import Customer, Instance
 
 
+def _build_instance(
+    i: int,
+    seed: np.random.SeedSequence,
+    nodes: np.ndarray,
+    depot: int,
+    inst_cfg: dict[str, Any],
+    city: str,
+) -> Instance:
+    rng = np.random.default_rng(seed)
+    n_customers = int(inst_cfg["n_customers"][i % len(inst_cfg["n_customers"])])
+    chosen = rng.choice(nodes, size=n_customers, replace=False)
+    residential = rng.random(n_customers) < float(inst_cfg["customer_types"]["residential_prob"])
+    tw_s, tw_e = sample_time_windows(rng, residential)
+    demand = sample_demands(
+        rng,
+        float(inst_cfg["demand"]["lambda"]),
+        int(inst_cfg["demand"]["min"]),
+        int(inst_cfg["demand"]["max"]),
+        n_customers,
+    )
+    service = rng.integers(inst_cfg["service_time_s"]["min"], inst_cfg["service_time_s"]["max"] + 1, size=n_customers)
+    customers = [
+        Customer(cid, node, dem, float(svc), start, end, "residential" if res else "commercial")
+        for cid, (node, dem, svc, start, end, res) in enumerate(
+            zip(chosen.tolist(), demand.tolist(), service.tolist(), tw_s.tolist(), tw_e.tolist(), residential.tolist()),
+            start=1,
+        )
+    ]
+    return Instance(
+        schema_version="1.0",
+        instance_id=f"{city.lower()}_{n_customers}_{i}",
+        city=city,
+        depot_node=depot,
+        customers=customers,
+        n_vehicles=int(inst_cfg["n_vehicles"]),
+        vehicle_capacity=int(inst_cfg["vehicle_capacity"]),
+    )
+
+
 def build_instances(g: nx.MultiDiGraph, cfg: dict[str, Any], city: str, rng: np.random.Generator) -> list[Instance]:
     inst_cfg = cfg["instance"]
     depot_cfg = inst_cfg.get("central_warehouse", {})
@@ -18,32 +58,13 @@ def build_instances(g: nx.MultiDiGraph, cfg: dict[str, Any], city: str, rng: np.
         depot = nearest_node(g, float(depot_cfg["lon"]), float(depot_cfg["lat"]))
     else:
         depot = int(sorted(g.nodes())[0])
-    nodes = [int(n) for n in g.nodes() if int(n) != depot]
-    instances: list[Instance] = []
-    for i in range(int(inst_cfg["n_instances"])):
-        n_customers = int(inst_cfg["n_customers"][i % len(inst_cfg["n_customers"])])
-        chosen = rng.choice(nodes, size=n_customers, replace=False)
-        customers: list[Customer] = []
-        for cid, node in enumerate(chosen, start=1):
-            kind = "residential" if rng.random() < float(inst_cfg["customer_types"]["residential_prob"]) else "commercial"
-            tw_s, tw_e = sample_time_window(rng, kind)
-            demand = sample_demand(
-                rng,
-                float(inst_cfg["demand"]["lambda"]),
-                int(inst_cfg["demand"]["min"]),
-                int(inst_cfg["demand"]["max"]),
-            )
-            service = float(rng.integers(inst_cfg["service_time_s"]["min"], inst_cfg["service_time_s"]["max"] + 1))
-            customers.append(Customer(cid, int(node), demand, service, tw_s, tw_e, kind))
-        instances.append(
-            Instance(
-                schema_version="1.0",
-                instance_id=f"{city.lower()}_{n_customers}_{i}",
-                city=city,
-                depot_node=depot,
-                customers=customers,
-                n_vehicles=int(inst_cfg["n_vehicles"]),
-                vehicle_capacity=int(inst_cfg["vehicle_capacity"]),
-            )
-        )
-    return instances
+    nodes = np.array([int(n) for n in g.nodes() if int(n) != depot], dtype=np.int64)
+    n_instances = int(inst_cfg["n_instances"])
+    # One child stream per instance: output depends on the seed only, never on the worker count.
+    seeds = np.random.SeedSequence(int(rng.integers(2**63))).spawn(n_instances)
+    args = [(i, seeds[i], nodes, depot, inst_cfg, city) for i in range(n_instances)]
+    workers = int(inst_cfg.get("workers", 1))
+    if workers <= 1 or n_instances <= 1:
+        return [_build_instance(*a) for a in args]
+    with ProcessPoolExecutor(max_workers=min(workers, n_instances)) as pool:
+        return list(pool.map(_build_instance, *zip(*args)))
@@ -11,3 +11,10 @@ def sample_time_window(rng: np.random.Generator, kind: str) -> tuple[float, floa
         start_h = float(rng.uniform(10.0, 14.0))
         width_h = float(rng.uniform(4.0, 7.0))
     return start_h * 3600, min(24 * 3600.0, (start_h + width_h) * 3600)
+
+
+def sample_time_windows(rng: np.random.Generator, residential: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    n = residential.shape[0]
+    start_h = np.where(residential, rng.uniform(9.0, 12.0, n), rng.uniform(10.0, 14.0, n))
+    width_h = np.where(residential, rng.uniform(3.0, 6.0, n), rng.uniform(4.0, 7.0, n))
+    return start_h * 3600, np.minimum(24 * 3600.0, (start_h + width_h) * 3600)
@@ -6,6 +6,8 @@ from pathlib import Path
 import networkx as nx
 from branca.element import MacroElement, Template
 
+from chandisvrp.geo.compiled import compile_graph
+from chandisvrp.geo.routing import RouteQueryEngine
 from chandisvrp.types import Instance, RoutePlan
 
 
@@ -24,12 +26,14 @@ def generate_route_map(
     plan: RoutePlan,
     out_html: str | Path,
     open_browser: bool = True,
+    engine: RouteQueryEngine | None = None,
 ) -> Path:
     try:
         import folium
     except Exception as exc:  # pragma: no cover - dependency runtime check
         raise RuntimeError("folium is required for interactive map generation") from exc
 
+    engine = engine if engine is not None else RouteQueryEngine(compile_graph(g))
     depot = g.nodes[instance.depot_node]
     c_lat, c_lon = _latlon_from_xy(float(depot.get("x", 0.0)), float(depot.get("y", 0.0)))
     m = folium.Map(location=[c_lat, c_lon], zoom_start=12, control_scale=True)
@@ -74,13 +78,13 @@ def generate_route_map(
         full_path_coords: list[tuple[float, float]] = []
         for i in range(len(route_nodes) - 1):
             u, v = route_nodes[i], route_nodes[i + 1]
-            try:
-                # Get shortest path in the graph
-                path = nx.shortest_path(g, u, v, weight="length")
+            # Get shortest path in the graph
+            _, path = engine.query(u, v)
+            if path:
                 for node in path[:-1]:  # Exclude last node to avoid duplicates
                     nd = g.nodes[node]
                     full_path_coords.append(_latlon_from_xy(float(nd.get("x", 0.0)), float(nd.get("y", 0.0))))
-            except (nx.NetworkXNoPath, nx.NodeNotFound):
+            else:
                 # Fallback to direct line if no path exists
                 u_nd = g.nodes[u]
                 full_path_coords.append(_latlon_from_xy(float(u_nd.get("x", 0.0)), float(u_nd.get("y", 0.0))))
@@ -20,10 +20,13 @@ def _draw_lines(c: canvas.Canvas, lines: list[str], x: float, y: float, h: float
     return y
 
 
-def generate_pdf_report(results_csv: str | Path, summary_csv: str | Path, out_pdf: str | Path) -> None:
+def generate_pdf_report(
+    results_csv: str | Path, summary_csv: str | Path, out_pdf: str | Path, traces_csv: str | Path | None = None
+) -> None:
     results = pd.read_csv(results_csv).sort_values(["instance_id", "solver", "run_seed"])
     summary = pd.read_csv(summary_csv).sort_values(["instance_id", "solver"])
-    plots = make_plots(results, summary, Path(out_pdf).parent / "_figures")
+    traces = pd.read_csv(traces_csv) if traces_csv and Path(traces_csv).exists() else None
+    plots = make_plots(results, summary, Path(out_pdf).parent / "_figures", traces)
 
     c = canvas.Canvas(str(out_pdf), pagesize=A4)
     w, h = A4
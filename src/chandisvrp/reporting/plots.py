@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 
@@ -42,7 +43,17 @@ def _annotate_bars(ax: plt.Axes, fmt: str = "{:.2f}") -> None:
         )
 
 
-def make_plots(results: pd.DataFrame, summary: pd.DataFrame, out_dir: str | Path) -> dict[str, Path]:
+def _anytime_gaps(traces: pd.DataFrame) -> pd.DataFrame:
+    # Gap to the best cost any job reached on the same instance; an instance whose best cost is
+    # zero has no relative gap and is left out.
+    ref = traces.groupby("instance_id")["cost"].transform("min")
+    gaps = traces.assign(gap_pct=(traces["cost"] / ref.where(ref > 0) - 1.0) * 100.0)
+    return gaps.dropna(subset=["gap_pct"])
+
+
+def make_plots(
+    results: pd.DataFrame, summary: pd.DataFrame, out_dir: str | Path, traces: pd.DataFrame | None = None
+) -> dict[str, Path]:
     out = Path(out_dir)
     out.mkdir(parents=True, exist_ok=True)
     artifacts: dict[str, Path] = {}
@@ -178,4 +189,26 @@ def make_plots(results: pd.DataFrame, summary: pd.DataFrame, out_dir: str | Path
     plt.close()
     artifacts["cost_per_delivery_vs_size"] = p6
 
+    gaps = _anytime_gaps(traces) if traces is not None and not traces.empty else None
+    if gaps is not None and not gaps.empty:
+        plt.figure(figsize=(7.4, 4.6))
+        # Best-so-far gap curves, averaged per solver.
+        grid = np.linspace(0.0, float(gaps["elapsed_s"].max()), 200)
+        for i, (solver, runs) in enumerate(gaps.groupby("solver")):
+            curves = []
+            for _, run in runs.groupby(["instance_id", "run_seed"]):
+                run = run.sort_values("elapsed_s")
+                idx = np.searchsorted(run["elapsed_s"].to_numpy(), grid, side="right") - 1
+                curves.append(np.where(idx >= 0, run["gap_pct"].to_numpy()[np.maximum(idx, 0)], np.nan))
+            plt.step(grid, pd.DataFrame(curves).mean(axis=0), where="post", color=colors[i % len(colors)], linewidth=2, label=solver)
+        plt.title("Anytime performance")
+        plt.xlabel("Elapsed (s)")
+        plt.ylabel("Gap to best (%)")
+        plt.legend(title="solver", frameon=False)
+        p7 = out / "anytime_performance.png"
+        plt.tight_layout()
+        plt.savefig(p7)
+        plt.close()
+        artifacts["anytime_performance"] = p7
+
     return artifacts
@@ -5,40 +5,65 @@ import time
 import networkx as nx
 import numpy as np
 
+from chandisvrp.instances.compiled import CompiledInstance, ensure_compiled
 from chandisvrp.solvers.base import Solver
-from chandisvrp.solvers.constructive import route_length
-from chandisvrp.solvers.split import split_by_capacity
+from chandisvrp.solvers.local_search import local_search
+from chandisvrp.solvers.route_opt import neighbor_lists
+from chandisvrp.solvers.route_state import RouteState
+from chandisvrp.solvers.split import optimal_split
 from chandisvrp.types import Instance, RoutePlan
 
 
 class ABCSolver(Solver):
     name = "abc"
+    ls_share = 0.2
 
-    def solve(self, g: nx.MultiDiGraph, instance: Instance, rng: np.random.Generator, time_limit_s: float) -> RoutePlan:
-        cids = [c.customer_id for c in instance.customers]
-        if not cids:
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
+        if not instance.customers:
             return RoutePlan(routes=[], meta={"iterations": 0, "improvements": 0})
-        node_of = {c.customer_id: c.node for c in instance.customers}
-        best = cids[:]
+        ci = ensure_compiled(g, instance, compiled)
+        if initial is not None:
+            routes = ci.to_point_routes(initial.routes)
+        else:
+            routes, _ = optimal_split(range(1, ci.n_customers + 1), ci.length_m, ci.demand, ci.capacity)
+        cache_before = ci.route_cache.stats()
+        state = RouteState(routes, ci.length_m, ci.demand, ci.capacity, ci.route_cache)
         start = time.time()
+        trace = self.trace()
+        trace.update(0, state.total)
         iterations = 0
         improvements = 0
-
-        def score(perm: list[int]) -> float:
-            routes = split_by_capacity(perm, instance.customers, instance.vehicle_capacity)
-            return sum(route_length(r, g, node_of, instance.depot_node) for r in routes)
-
-        best_s = score(best)
-        while time.time() - start < time_limit_s:
+        while (now := time.time()) - start < time_limit_s * (1.0 - self.ls_share):
             iterations += 1
-            cand = best[:]
-            i, j = rng.integers(0, len(cand), size=2)
-            cand[i], cand[j] = cand[j], cand[i]
-            sc = score(cand)
-            if sc < best_s:
-                best, best_s = cand, sc
+            a, b = rng.integers(1, ci.n_customers + 1, size=2).tolist()
+            delta = state.swap_delta(a, b)
+            if delta is not None and delta < -1e-9:
+                state.apply_swap(a, b)
                 improvements += 1
+                trace.update(iterations, state.total)
+            elif iterations % 64 == 0 and trace.stalled(iterations, now):
+                break
+        if self.ls_share > 0:
+            neighbors = neighbor_lists(ci.length_m, 16)
+            local_search(state, neighbors, time_limit_s - (time.time() - start))
+        best_s = state.recompute()
+        trace.update(iterations, best_s)
         return RoutePlan(
-            routes=split_by_capacity(best, instance.customers, instance.vehicle_capacity),
-            meta={"iterations": iterations, "improvements": improvements, "best_score": float(best_s)},
+            routes=ci.to_id_routes([r for r in state.routes if r]),
+            meta={
+                "iterations": iterations,
+                "improvements": improvements,
+                "best_score": float(best_s),
+                "evaluations": iterations,
+                "trace": trace.points,
+                "route_cache": state.cache.stats_since(cache_before),
+            },
         )
@@ -5,59 +5,115 @@ import time
 import networkx as nx
 import numpy as np
 
+from chandisvrp.instances.compiled import CompiledInstance, ensure_compiled
 from chandisvrp.solvers.base import Solver
-from chandisvrp.solvers.constructive import route_length
-from chandisvrp.solvers.split import split_by_capacity
+from chandisvrp.solvers.batch_eval import evaluate_permutations
+from chandisvrp.solvers.route_opt import nearest_matrix
+from chandisvrp.solvers.split import optimal_split
 from chandisvrp.types import Instance, RoutePlan
 
 
 class ACOSolver(Solver):
+    """Giant-tour ACO with pheromone on candidate-list arcs, all ants advanced together in NumPy.
+
+    Each ant builds an order over customers from the depot; ``optimal_split`` turns it into
+    routes. Pheromone follows the MAX-MIN scheme: evaporate everywhere, deposit along the
+    iteration-best and best-so-far tours, clamp to ``[tau_min, tau_max]``.
+    """
+
     name = "aco"
+    ants_per_iter = 8
+    n_candidates = 20
+    alpha = 1.0
+    beta = 2.0
+    rho = 0.1
 
-    def solve(self, g: nx.MultiDiGraph, instance: Instance, rng: np.random.Generator, time_limit_s: float) -> RoutePlan:
-        cids = [c.customer_id for c in instance.customers]
-        if not cids:
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
+        if not instance.customers:
             return RoutePlan(routes=[], meta={"iterations": 0, "improvements": 0})
-        node_of = {c.customer_id: c.node for c in instance.customers}
-        pher = {cid: 1.0 for cid in cids}
-        best_perm = cids[:]
-        ants_per_iter = 8
+        ci = ensure_compiled(g, instance, compiled)
+        dist = ci.length_m
+        n = ci.n_customers
+        k = min(self.n_candidates, n)
+        ants = self.ants_per_iter
+        cand = nearest_matrix(dist, k, np.arange(n + 1), np.arange(1, n + 1))
+        eta_beta = (1.0 / np.maximum(np.asarray(dist[np.arange(n + 1)[:, None], cand], dtype=float), 1.0)) ** self.beta
         iterations = 0
         improvements = 0
 
         def score(perm: list[int]) -> float:
-            routes = split_by_capacity(perm, instance.customers, instance.vehicle_capacity)
-            return sum(route_length(r, g, node_of, instance.depot_node) for r in routes)
+            return optimal_split(perm, dist, ci.demand, ci.capacity)[1]
+
+        def arc_slots(tour: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            # Candidate-list slots of the depot -> t0 -> t1 ... arcs; arcs outside the lists are dropped.
+            frm = np.concatenate([[0], tour[:-1]])
+            hit = cand[frm] == tour[:, None]
+            ok = hit.any(axis=1)
+            return frm[ok], hit[ok].argmax(axis=1)
 
-        def weighted_permutation() -> list[int]:
-            vals = np.array([max(1e-12, pher[c]) for c in cids], dtype=float)
-            # Exponential race gives weighted sampling without replacement.
-            keys = -np.log(np.maximum(rng.random(len(cids)), 1e-12)) / vals
-            order = np.argsort(keys)
-            return [cids[int(idx)] for idx in order]
+        def build_tours(weights: np.ndarray) -> np.ndarray:
+            tours = np.empty((ants, n), dtype=np.int64)
+            visited = np.zeros((ants, n + 1), dtype=bool)
+            visited[:, 0] = True
+            cur = np.zeros(ants, dtype=np.int64)
+            rows = np.arange(ants)
+            for step in range(n):
+                nxt = cand[cur]
+                w = weights[cur] * ~visited[rows[:, None], nxt]
+                total = w.sum(axis=1)
+                cum = np.cumsum(w, axis=1)
+                pick = (cum <= (rng.random(ants) * total)[:, None]).sum(axis=1)
+                choice = nxt[rows, np.minimum(pick, k - 1)]
+                stuck = (total <= 0) | visited[rows, choice]
+                if stuck.any():
+                    # Every candidate is taken: fall back to the nearest unvisited customer.
+                    s = np.flatnonzero(stuck)
+                    far = np.where(visited[s], np.inf, np.asarray(dist[cur[s]], dtype=float))
+                    choice[s] = far.argmin(axis=1)
+                tours[:, step] = choice
+                visited[rows, choice] = True
+                cur = choice
+            return tours
 
+        best_perm = [p for r in ci.to_point_routes(initial.routes) for p in r] if initial is not None else list(range(1, n + 1))
         best_score = score(best_perm)
+        tau_max = 1.0 / (self.rho * max(best_score, 1e-9))
+        tau = np.full((n + 1, k), tau_max)
         start = time.time()
-        while time.time() - start < time_limit_s:
+        trace = self.trace()
+        trace.update(0, best_score)
+        while time.time() - start < time_limit_s and not trace.stalled(iterations * ants):
             iterations += 1
-            ants: list[list[int]] = []
-            for _ in range(ants_per_iter):
-                ants.append(weighted_permutation())
-            for perm in ants:
-                sc = score(perm)
-                if sc < best_score:
-                    best_perm, best_score = perm, sc
-                    improvements += 1
-                for c in perm:
-                    pher[c] = 0.95 * pher[c] + 0.05 * (1.0 / (1.0 + sc))
-            for c in pher:
-                pher[c] = max(1e-6, pher[c] * 0.995)
+            tours = build_tours(tau**self.alpha * eta_beta)
+            # Rank the whole batch with the vectorized greedy split, then price the winner optimally.
+            it = int(np.argmin(evaluate_permutations(tours, dist, ci.demand, ci.capacity)[0]))
+            it_score = score(tours[it].tolist())
+            if it_score < best_score:
+                best_perm, best_score = tours[it].tolist(), it_score
+                improvements += 1
+                trace.update(iterations * ants, best_score)
+                tau_max = 1.0 / (self.rho * max(best_score, 1e-9))
+            tau *= 1.0 - self.rho
+            for tour, sc in ((tours[it], it_score), (np.asarray(best_perm), best_score)):
+                frm, slot = arc_slots(tour)
+                np.add.at(tau, (frm, slot), 1.0 / max(sc, 1e-9))
+            np.clip(tau, tau_max / (2.0 * n), tau_max, out=tau)
         return RoutePlan(
-            routes=split_by_capacity(best_perm, instance.customers, instance.vehicle_capacity),
+            routes=ci.to_id_routes(optimal_split(best_perm, dist, ci.demand, ci.capacity)[0]),
             meta={
                 "iterations": iterations,
                 "improvements": improvements,
-                "ants_per_iter": ants_per_iter,
+                "ants_per_iter": ants,
                 "best_score": float(best_score),
+                "evaluations": iterations * ants,
+                "trace": trace.points,
             },
         )
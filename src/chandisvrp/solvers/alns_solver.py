@@ -1,49 +1,139 @@
 from __future__ import annotations
 
-import copy
 import math
 import time
 
 import networkx as nx
 import numpy as np
 
+from chandisvrp.instances.compiled import CompiledInstance, ensure_compiled
 from chandisvrp.solvers.base import Solver
-from chandisvrp.solvers.constructive import NearestNeighbor2OptSolver, route_length
-from chandisvrp.solvers.operators_destroy import random_destroy
-from chandisvrp.solvers.operators_repair import greedy_repair
-from chandisvrp.solvers.split import split_by_capacity
+from chandisvrp.solvers.constructive import nearest_neighbor_order
+from chandisvrp.solvers.local_search import improve_routes
+from chandisvrp.solvers.operators_destroy import (
+    random_destroy,
+    route_destroy,
+    shaw_destroy,
+    worst_destroy,
+)
+from chandisvrp.solvers.operators_repair import regret_repair
+from chandisvrp.solvers.route_opt import neighbor_lists, optimize_route
+from chandisvrp.solvers.split import split_points
 from chandisvrp.types import Instance, RoutePlan
 
 
 class ALNSSolver(Solver):
+    """Adaptive LNS: roulette-wheel destroy/repair selection with Ropke-Pisinger scoring, SA acceptance.
+
+    Candidates share every untouched route list with the current solution, so an iteration costs
+    the removal plus the re-priced routes, never a full copy.
+    """
+
     name = "alns"
+    ls_share = 0.2
+    n_neighbors = 16
+    segment = 50
+    reaction = 0.1
+    # Scores for a new global best, an improvement on the current solution, an accepted worse one.
+    sigma = (33.0, 9.0, 13.0)
 
-    def solve(self, g: nx.MultiDiGraph, instance: Instance, rng: np.random.Generator, time_limit_s: float) -> RoutePlan:
-        seed_plan = NearestNeighbor2OptSolver().solve(g, instance, rng, 1)
-        node_of = {c.customer_id: c.node for c in instance.customers}
-
-        def score(routes: list[list[int]]) -> float:
-            cap_pen = 0.0
-            cmap = {c.customer_id: c for c in instance.customers}
-            for r in routes:
-                load = sum(cmap[c].demand for c in r)
-                cap_pen += max(0, load - instance.vehicle_capacity) * 1e5
-            return sum(route_length(r, g, node_of, instance.depot_node) for r in routes) + cap_pen
-
-        curr = copy.deepcopy(seed_plan.routes)
-        best = copy.deepcopy(curr)
-        curr_s = best_s = score(curr)
-        temp = 100.0
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
+        if not instance.customers:
+            return RoutePlan(routes=[], meta={"iterations": 0})
         start = time.time()
-        while time.time() - start < time_limit_s:
-            destroyed, removed = random_destroy(curr, rng)
-            repaired = greedy_repair(destroyed, removed, rng)
-            cand_flat = [c for r in repaired for c in r]
-            repaired = split_by_capacity(cand_flat, instance.customers, instance.vehicle_capacity)
-            cand_s = score(repaired)
-            if cand_s < curr_s or rng.random() < math.exp((curr_s - cand_s) / max(1e-6, temp)):
-                curr, curr_s = repaired, cand_s
-            if cand_s < best_s:
-                best, best_s = repaired, cand_s
-            temp *= 0.995
-        return RoutePlan(routes=best)
+        trace = self.trace()
+        ci = ensure_compiled(g, instance, compiled)
+        dist, demand, cap = ci.length_m, ci.demand, ci.capacity
+        n = ci.n_customers
+        neighbors = neighbor_lists(dist, self.n_neighbors)
+        destroyers = {
+            "random": lambda routes, q: random_destroy(routes, rng, size=q),
+            "worst": lambda routes, q: worst_destroy(routes, rng, q, dist),
+            "shaw": lambda routes, q: shaw_destroy(routes, rng, q, neighbors),
+            "route": lambda routes, q: route_destroy(routes, rng, q),
+        }
+        repairers = {
+            "greedy": lambda routes, removed: regret_repair(routes, removed, dist, demand, cap, k=1),
+            "regret2": lambda routes, removed: regret_repair(routes, removed, dist, demand, cap, k=2),
+            "regret3": lambda routes, removed: regret_repair(routes, removed, dist, demand, cap, k=3),
+        }
+        ops = {"destroy": list(destroyers), "repair": list(repairers)}
+        weights = {kind: np.ones(len(names)) for kind, names in ops.items()}
+        scores = {kind: np.zeros(len(names)) for kind, names in ops.items()}
+        uses = {kind: np.zeros(len(names)) for kind, names in ops.items()}
+        q_lo = min(n, 4)
+        q_hi = max(q_lo, min(60, int(0.3 * n)))
+
+        def pick(kind: str) -> int:
+            w = weights[kind]
+            return int(np.searchsorted(np.cumsum(w), rng.random() * w.sum(), side="right"))
+
+        if initial is not None:
+            curr = [r for r in ci.to_point_routes(initial.routes) if r]
+        else:
+            # The nn2opt construction, reusing this solver's neighbor lists; it counts against the budget.
+            curr = [optimize_route(r, dist, neighbors) for r in split_points(nearest_neighbor_order(ci), demand, cap)]
+        # Routes shared with the current solution are priced by identity, re-created ones by the cache.
+        cache = ci.route_cache
+        cache_before = cache.stats()
+        cost_of = {id(r): cache(r) for r in curr}
+        curr_s = sum(cost_of.values())
+        best, best_s = curr, curr_s
+        trace.update(0, best_s)
+        # A zero-cost seed (every customer on the depot) still needs a positive temperature.
+        t0 = max(-0.05 * curr_s / math.log(0.5), 1e-9)
+        t_end = t0 / 1000.0
+        budget = time_limit_s * (1.0 - self.ls_share)
+        iterations = 0
+        while (elapsed := time.time() - start) < budget and not trace.stalled(iterations):
+            iterations += 1
+            temp = t0 * (t_end / t0) ** (elapsed / max(budget, 1e-9))
+            di, ri = pick("destroy"), pick("repair")
+            destroyed, removed = destroyers[ops["destroy"][di]](curr, int(rng.integers(q_lo, q_hi + 1)))
+            cand = repairers[ops["repair"][ri]](destroyed, removed)
+            cand_cost = {id(r): cost_of[id(r)] if id(r) in cost_of else cache(r) for r in cand}
+            cand_s = sum(cand_cost.values())
+            gain = 0.0
+            if cand_s < best_s - 1e-9:
+                best, best_s = cand, cand_s
+                gain = self.sigma[0]
+                trace.update(iterations, best_s)
+            if cand_s < curr_s - 1e-9 or rng.random() < math.exp((curr_s - cand_s) / max(1e-9, temp)):
+                gain = gain or (self.sigma[1] if cand_s < curr_s - 1e-9 else self.sigma[2])
+                curr, curr_s = cand, cand_s
+                cost_of = cand_cost
+            for kind, i in (("destroy", di), ("repair", ri)):
+                scores[kind][i] += gain
+                uses[kind][i] += 1
+            if iterations % self.segment == 0:
+                for kind in ops:
+                    seen = uses[kind] > 0
+                    weights[kind][seen] = (1 - self.reaction) * weights[kind][seen] + self.reaction * (
+                        scores[kind][seen] / uses[kind][seen]
+                    )
+                    weights[kind] = np.maximum(weights[kind], 1e-3)
+                    scores[kind][:] = 0
+                    uses[kind][:] = 0
+        if self.ls_share > 0:
+            best = improve_routes(ci, best, time_limit_s - (time.time() - start), neighbors=neighbors)
+        best_s = float(sum(cache(r) for r in best))
+        trace.update(iterations, best_s)
+        return RoutePlan(
+            routes=ci.to_id_routes(best),
+            meta={
+                "iterations": iterations,
+                "best_score": best_s,
+                "weights": {kind: dict(zip(names, weights[kind].round(3).tolist())) for kind, names in ops.items()},
+                "evaluations": iterations,
+                "trace": trace.points,
+                "route_cache": cache.stats_since(cache_before),
+            },
+        )
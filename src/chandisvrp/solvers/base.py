@@ -1,16 +1,80 @@
 from __future__ import annotations
 
+import math
+import time
 from abc import ABC, abstractmethod
 
 import networkx as nx
 import numpy as np
 
+from chandisvrp.instances.compiled import CompiledInstance
 from chandisvrp.types import Instance, RoutePlan
 
 
+class Trace:
+    """Best-so-far ``(elapsed_s, evaluations, cost)`` curve; a point is stored only on improvement.
+
+    ``stalled`` reports when ``stall_s`` seconds or ``stall_evals`` evaluations have passed
+    since the last improvement (either limit may be ``None``).
+    """
+
+    def __init__(self, stall_s: float | None = None, stall_evals: int | None = None):
+        self.start = time.time()
+        self.stall_s = stall_s
+        self.stall_evals = stall_evals
+        self.best = math.inf
+        self.points: list[tuple[float, int, float]] = []
+        self._best_t = self.start
+        self._best_evals = 0
+
+    def update(self, evals: int, cost: float) -> bool:
+        if cost >= self.best - 1e-9:
+            return False
+        self.record(evals, cost)
+        return True
+
+    def record(self, evals: int, cost: float) -> None:
+        """Store a new incumbent unconditionally, for solvers that rank by a different objective."""
+        now = time.time()
+        self.best = float(cost)
+        self._best_t, self._best_evals = now, evals
+        self.points.append((round(now - self.start, 4), int(evals), self.best))
+
+    def extend(self, points: list[tuple[float, int, float]], t_offset: float, evals_offset: int) -> None:
+        """Append another run's points, shifted to start at ``t_offset`` / ``evals_offset``."""
+        for t, e, c in points:
+            if c < self.best - 1e-9:
+                self.best = float(c)
+                self._best_t, self._best_evals = self.start + t_offset + t, evals_offset + e
+                self.points.append((round(t_offset + t, 4), int(evals_offset + e), self.best))
+
+    def stalled(self, evals: int, now: float | None = None) -> bool:
+        if self.stall_evals is not None and evals - self._best_evals >= self.stall_evals:
+            return True
+        if self.stall_s is not None:
+            return (time.time() if now is None else now) - self._best_t >= self.stall_s
+        return False
+
+
 class Solver(ABC):
     name: str
+    # Optional early stop for the metaheuristics: give up after this long without improvement.
+    stall_s: float | None = None
+    stall_evals: int | None = None
+    # Depot departure (seconds after midnight) for solvers that model time windows.
+    start_s: float = 8 * 3600.0
+
+    def trace(self) -> Trace:
+        return Trace(self.stall_s, self.stall_evals)
 
     @abstractmethod
-    def solve(self, g: nx.MultiDiGraph, instance: Instance, rng: np.random.Generator, time_limit_s: float) -> RoutePlan:
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
         raise NotImplementedError
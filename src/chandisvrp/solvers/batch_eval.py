@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def greedy_cuts(perms: np.ndarray, demand: np.ndarray, capacity: int) -> np.ndarray:
+    """Route starts of ``split_points`` for every row of ``perms``, as a ``(k, n)`` boolean mask.
+
+    Rows are laid end to end in one offset cumulative-load array, so each round of cuts for all
+    rows is a single ``searchsorted``; the number of rounds is the longest row's route count.
+    """
+    k, n = perms.shape
+    starts = np.zeros((k, n), dtype=bool)
+    if n == 0:
+        return starts
+    cum = np.cumsum(demand[perms], axis=1)
+    stride = int(cum[:, -1].max()) + int(capacity) + 1
+    flat = (cum + (np.arange(k) * stride)[:, None]).ravel()
+    rows = np.arange(k)
+    start = np.zeros(k, dtype=np.int64)
+    base = np.zeros(k, dtype=np.int64)
+    live = rows
+    while live.size:
+        starts[live, start[live]] = True
+        end = np.searchsorted(flat, base[live] + capacity + live * stride, side="right") - live * n
+        # A customer heavier than a whole vehicle still gets a route of its own.
+        end = np.maximum(end, start[live] + 1)
+        base[live] = cum[live, end - 1]
+        start[live] = end
+        live = live[end < n]
+    return starts
+
+
+def evaluate_permutations(
+    perms: np.ndarray, dist, demand: np.ndarray, capacity: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Cost of greedily splitting each row of a ``(k, n)`` point-permutation array, in one pass.
+
+    Returns ``(costs, starts)``: the giant-tour arcs are gathered at once, arcs that cross a cut
+    are swapped for the depot legs, and rows are reduced with sums.
+    """
+    perms = np.asarray(perms, dtype=np.int64)
+    k, n = perms.shape
+    if n == 0:
+        return np.zeros(k), np.zeros((k, 0), dtype=bool)
+    starts = greedy_cuts(perms, demand, capacity)
+    ends = np.empty_like(starts)
+    ends[:, :-1] = starts[:, 1:]
+    ends[:, -1] = True
+    depot = np.zeros_like(perms)
+    out = np.asarray(dist[depot, perms], dtype=float)
+    back = np.asarray(dist[perms, depot], dtype=float)
+    arcs = np.asarray(dist[perms[:, :-1], perms[:, 1:]], dtype=float)
+    costs = (out * starts).sum(axis=1) + (back * ends).sum(axis=1) + (arcs * ~starts[:, 1:]).sum(axis=1)
+    return costs, starts
+
+
+def routes_from_starts(perm: np.ndarray, starts: np.ndarray) -> list[list[int]]:
+    """Routes of one row of ``evaluate_permutations``."""
+    return [r.tolist() for r in np.split(np.asarray(perm), np.flatnonzero(starts)[1:])]
@@ -1,90 +1,101 @@
 from __future__ import annotations
 
-import math
-
 import networkx as nx
 import numpy as np
 
+from chandisvrp.instances.compiled import CompiledInstance, ensure_compiled
 from chandisvrp.solvers.base import Solver
-from chandisvrp.solvers.split import split_by_capacity
+from chandisvrp.solvers.route_opt import neighbor_lists, optimize_route
+from chandisvrp.solvers.split import split_by_capacity, split_points
 from chandisvrp.types import Instance, RoutePlan
 
 
-def _coords(g: nx.MultiDiGraph, node: int) -> tuple[float, float]:
-    d = g.nodes[node]
-    return float(d.get("x", 0.0)), float(d.get("y", 0.0))
+def two_opt(route: list[int], dist: np.ndarray, neighbors: dict[int, list[int]] | None = None) -> list[int]:
+    return optimize_route(route, dist, neighbors, or_opt_max=0)
 
 
-def _dist(g: nx.MultiDiGraph, a: int, b: int) -> float:
-    ax, ay = _coords(g, a)
-    bx, by = _coords(g, b)
-    return math.hypot(ax - bx, ay - by)
+def route_length(route: list[int], dist: np.ndarray) -> float:
+    """Closed depot tour over point indices (0 is the depot) priced from a point-space matrix."""
+    if not route:
+        return 0.0
+    return float(dist[[0, *route], [*route, 0]].sum())
 
 
-def two_opt(route: list[int], g: nx.MultiDiGraph, node_of: dict[int, int], depot: int) -> list[int]:
-    best = route[:]
-    improved = True
-    while improved:
-        improved = False
-        for i in range(1, len(best) - 1):
-            for j in range(i + 1, len(best)):
-                cand = best[:i] + best[i:j][::-1] + best[j:]
-                if route_length(cand, g, node_of, depot) < route_length(best, g, node_of, depot):
-                    best = cand
-                    improved = True
-    return best
+def plan_length(ci: CompiledInstance, routes: list[list[int]]) -> float:
+    """Total length of customer-id ``routes`` on ``ci``."""
+    return float(sum(route_length(r, ci.length_m) for r in ci.to_point_routes(routes)))
 
 
-def route_length(route: list[int], g: nx.MultiDiGraph, node_of: dict[int, int], depot: int) -> float:
-    cur = depot
-    total = 0.0
-    for cid in route:
-        n = node_of[cid]
-        total += _dist(g, cur, n)
-        cur = n
-    total += _dist(g, cur, depot)
-    return total
+def nearest_neighbor_order(ci: CompiledInstance) -> list[int]:
+    n = ci.n_customers
+    dist = ci.length_m
+    visited = np.zeros(n + 1, dtype=bool)
+    visited[0] = True
+    order: list[int] = []
+    cur = 0
+    for _ in range(n):
+        d = np.where(visited, np.inf, dist[cur])
+        cur = int(np.argmin(d))
+        visited[cur] = True
+        order.append(cur)
+    return order
 
 
 class NearestNeighbor2OptSolver(Solver):
     name = "nn2opt"
-
-    def solve(self, g: nx.MultiDiGraph, instance: Instance, rng: np.random.Generator, time_limit_s: float) -> RoutePlan:
-        remaining = set(c.customer_id for c in instance.customers)
-        node_of = {c.customer_id: c.node for c in instance.customers}
-        order: list[int] = []
-        cur = instance.depot_node
-        while remaining:
-            nxt = min(remaining, key=lambda cid: _dist(g, cur, node_of[cid]))
-            order.append(nxt)
-            cur = node_of[nxt]
-            remaining.remove(nxt)
-        routes = split_by_capacity(order, instance.customers, instance.vehicle_capacity)
-        routes = [two_opt(r, g, node_of, instance.depot_node) if len(r) > 3 else r for r in routes]
-        return RoutePlan(routes=routes)
+    n_neighbors = 16
+    # Share of ``time_limit_s`` given to inter-route local search; off for the plain baseline.
+    ls_share = 0.0
+
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
+        ci = ensure_compiled(g, instance, compiled)
+        routes = split_points(nearest_neighbor_order(ci), ci.demand, ci.capacity)
+        neighbors = neighbor_lists(ci.length_m, self.n_neighbors)
+        routes = [optimize_route(r, ci.length_m, neighbors) for r in routes]
+        if self.ls_share > 0:
+            from chandisvrp.solvers.local_search import improve_routes
+
+            routes = improve_routes(ci, routes, time_limit_s * self.ls_share, neighbors=neighbors)
+        return RoutePlan(routes=ci.to_id_routes(routes))
 
 
 class NearestNeighborSolver(Solver):
     name = "nearest_neighbor"
 
-    def solve(self, g: nx.MultiDiGraph, instance: Instance, rng: np.random.Generator, time_limit_s: float) -> RoutePlan:
-        remaining = set(c.customer_id for c in instance.customers)
-        node_of = {c.customer_id: c.node for c in instance.customers}
-        order: list[int] = []
-        cur = instance.depot_node
-        while remaining:
-            nxt = min(remaining, key=lambda cid: _dist(g, cur, node_of[cid]))
-            order.append(nxt)
-            cur = node_of[nxt]
-            remaining.remove(nxt)
-        routes = split_by_capacity(order, instance.customers, instance.vehicle_capacity)
-        return RoutePlan(routes=routes)
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
+        ci = ensure_compiled(g, instance, compiled)
+        routes = split_points(nearest_neighbor_order(ci), ci.demand, ci.capacity)
+        return RoutePlan(routes=ci.to_id_routes(routes))
 
 
 class RandomSolver(Solver):
     name = "random"
 
-    def solve(self, g: nx.MultiDiGraph, instance: Instance, rng: np.random.Generator, time_limit_s: float) -> RoutePlan:
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
         order = [c.customer_id for c in instance.customers]
         rng.shuffle(order)
         routes = split_by_capacity(order, instance.customers, instance.vehicle_capacity)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import time
+
 import networkx as nx
 import numpy as np
 
+from chandisvrp.instances.compiled import CompiledInstance, ensure_compiled
 from chandisvrp.solvers.abc_solver import ABCSolver
 from chandisvrp.solvers.aco_solver import ACOSolver
 from chandisvrp.solvers.base import Solver
@@ -12,16 +15,26 @@ from chandisvrp.types import Instance, RoutePlan
 class HybridACOABCSolver(Solver):
     name = "hybrid_aco_abc"
 
-    def solve(self, g: nx.MultiDiGraph, instance: Instance, rng: np.random.Generator, time_limit_s: float) -> RoutePlan:
-        aco_plan = ACOSolver().solve(g, instance, rng, time_limit_s * 0.5)
-        flat = [cid for r in aco_plan.routes for cid in r]
-        tmp_instance = Instance(
-            schema_version=instance.schema_version,
-            instance_id=instance.instance_id,
-            city=instance.city,
-            depot_node=instance.depot_node,
-            customers=sorted(instance.customers, key=lambda c: flat.index(c.customer_id) if c.customer_id in flat else 10**9),
-            n_vehicles=instance.n_vehicles,
-            vehicle_capacity=instance.vehicle_capacity,
-        )
-        return ABCSolver().solve(g, tmp_instance, rng, time_limit_s * 0.5)
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
+        ci = ensure_compiled(g, instance, compiled)
+        trace = self.trace()
+        aco, abc = ACOSolver(), ABCSolver()
+        for stage in (aco, abc):
+            stage.stall_s, stage.stall_evals, stage.start_s = self.stall_s, self.stall_evals, self.start_s
+        aco_plan = aco.solve(g, instance, rng, time_limit_s * 0.5, compiled=ci, initial=initial)
+        # Time ACO leaves unused after stalling goes to ABC.
+        offset = time.time() - trace.start
+        plan = abc.solve(g, instance, rng, time_limit_s - offset, compiled=ci, initial=aco_plan)
+        evals = int(aco_plan.meta.get("evaluations", 0))
+        trace.extend(aco_plan.meta.get("trace", []), 0.0, 0)
+        trace.extend(plan.meta.get("trace", []), offset, evals)
+        plan.meta.update(evaluations=evals + int(plan.meta.get("evaluations", 0)), trace=trace.points)
+        return plan
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any
+
+import networkx as nx
+import numpy as np
+
+from chandisvrp.geo.matrix import DistanceMatrix
+from chandisvrp.geo.tiled_matrix import LazyQuantity
+from chandisvrp.instances.compiled import (
+    CompiledInstance,
+    compile_instance,
+    ensure_compiled,
+)
+from chandisvrp.solvers.base import Solver
+from chandisvrp.solvers.constructive import plan_length
+from chandisvrp.types import Customer, FlatRoutePlan, Instance, RoutePlan
+
+_POOLS: dict[int, ProcessPoolExecutor] = {}
+# Worker-side view of the most recent shared problem block; views must die before the block closes.
+_ATTACHED: dict[str, Any] = {}
+
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    # Pools outlive a single solve so that every benchmark job does not pay for process start-up.
+    if workers not in _POOLS:
+        _POOLS[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _POOLS[workers]
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    for pool in _POOLS.values():
+        pool.shutdown(cancel_futures=True)
+    _POOLS.clear()
+
+
+def _discard_pool(workers: int) -> None:
+    # A crashed worker leaves the executor broken for good; the next solve starts a fresh one.
+    pool = _POOLS.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+_Spec = dict[str, tuple[int, tuple[int, ...], str]]
+
+
+def _share_problem(ci: CompiledInstance) -> tuple[shared_memory.SharedMemory, _Spec, dict[str, Any]]:
+    """Copy the instance's rows of the matrix and its customer columns into one shared block.
+
+    A tiled matrix is not copied: its tiles for the instance rows are filled and the workers
+    read them from the memory-mapped files named in the header. Returns the block, the layout
+    of its arrays and a small header with the scalar instance fields, which is all a worker
+    needs to rebuild the ``Instance``.
+    """
+    inst = ci.instance
+    kinds = sorted({c.kind for c in inst.customers})
+    code = {k: i for i, k in enumerate(kinds)}
+    cs = inst.customers
+    # Customers sharing a node share a row; the worker matrix holds each node once.
+    rows = np.array(list(dict.fromkeys(ci.rows.tolist())), dtype=np.int64)
+    arrays = {
+        "nodes": np.asarray(ci.matrix.nodes, dtype=np.int64)[rows],
+        "rows": rows,
+        "customer_id": np.array([c.customer_id for c in cs], dtype=np.int64),
+        "node": np.array([c.node for c in cs], dtype=np.int64),
+        "demand": np.array([c.demand for c in cs], dtype=np.int64),
+        "service_time_s": np.array([c.service_time_s for c in cs], dtype=float),
+        "tw_start_s": np.array([c.tw_start_s for c in cs], dtype=float),
+        "tw_end_s": np.array([c.tw_end_s for c in cs], dtype=float),
+        "kind": np.array([code[c.kind] for c in cs], dtype=np.int32),
+    }
+    files: dict[str, str] = {}
+    for q in ("length_m", "time_s"):
+        arr = getattr(ci.matrix, q)
+        if isinstance(arr, LazyQuantity):
+            files[q] = str(arr.file(rows))
+        else:
+            arrays[q] = np.asarray(arr[np.ix_(rows, rows)])
+    spec, offset = {}, 0
+    for name, arr in arrays.items():
+        spec[name] = (offset, arr.shape, arr.dtype.str)
+        offset += -(-arr.nbytes // 64) * 64
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for name, arr in arrays.items():
+        off, shape, dtype = spec[name]
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=off)[...] = arr
+    head = {
+        "schema_version": inst.schema_version,
+        "instance_id": inst.instance_id,
+        "city": inst.city,
+        "depot_node": inst.depot_node,
+        "n_vehicles": inst.n_vehicles,
+        "vehicle_capacity": inst.vehicle_capacity,
+        "kinds": kinds,
+        "files": files,
+    }
+    return shm, spec, head
+
+
+def _attached_problem(shm_name: str, spec: _Spec, head: dict[str, Any]) -> tuple[Instance, CompiledInstance]:
+    # Attached and compiled once per block, so later epochs of the same solve reuse both.
+    if _ATTACHED.get("name") != shm_name:
+        old = _ATTACHED.pop("shm", None)
+        _ATTACHED.clear()
+        if old is not None:
+            try:
+                old.close()
+            except BufferError:
+                pass
+        shm = shared_memory.SharedMemory(name=shm_name)
+        # The parent owns (and unlinks) the block. Forked workers share its resource tracker;
+        # spawned ones have their own, which must not unlink the block when the worker exits.
+        if multiprocessing.get_start_method() != "fork":
+            resource_tracker.unregister(shm._name, "shared_memory")
+        v = {name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=off) for name, (off, shape, dtype) in spec.items()}
+        kinds = head["kinds"]
+        customers = [
+            Customer(cid, node, dem, svc, tws, twe, kinds[k])
+            for cid, node, dem, svc, tws, twe, k in zip(
+                v["customer_id"].tolist(),
+                v["node"].tolist(),
+                v["demand"].tolist(),
+                v["service_time_s"].tolist(),
+                v["tw_start_s"].tolist(),
+                v["tw_end_s"].tolist(),
+                v["kind"].tolist(),
+            )
+        ]
+        instance = Instance(
+            head["schema_version"],
+            head["instance_id"],
+            head["city"],
+            head["depot_node"],
+            customers,
+            head["n_vehicles"],
+            head["vehicle_capacity"],
+        )
+        ix = np.ix_(v["rows"], v["rows"])
+        mats = [v[q] if q in v else np.load(head["files"][q], mmap_mode="r")[ix] for q in ("length_m", "time_s")]
+        matrix = DistanceMatrix(v["nodes"], *mats)
+        _ATTACHED.update(name=shm_name, shm=shm, instance=instance, compiled=compile_instance(instance, matrix))
+    return _ATTACHED["instance"], _ATTACHED["compiled"]
+
+
+def _run_island(
+    solver_cls: type[Solver],
+    shm_name: str,
+    spec: _Spec,
+    head: dict[str, Any],
+    seed: np.random.SeedSequence,
+    time_limit_s: float,
+    initial: FlatRoutePlan | None,
+    knobs: dict[str, Any],
+) -> tuple[FlatRoutePlan, float, dict[str, Any]]:
+    instance, ci = _attached_problem(shm_name, spec, head)
+    solver = solver_cls()
+    for key, value in knobs.items():
+        setattr(solver, key, value)
+    plan = solver.solve(
+        None,
+        instance,
+        np.random.default_rng(seed),
+        time_limit_s,
+        compiled=ci,
+        initial=initial.to_plan() if initial is not None else None,
+    )
+    # Plans cross the process boundary as two flat arrays rather than nested lists.
+    return FlatRoutePlan.from_routes(plan.routes), plan_length(ci, plan.routes), plan.meta
+
+
+class IslandSolver(Solver):
+    """Runs ``n_islands`` copies of a solver in worker processes and migrates elites between epochs.
+
+    The time budget is cut into ``epochs``. Each island has its own seed stream. After every
+    epoch, island ``i`` restarts from the better of its own plan and the plan of island ``i-1``
+    (ring migration). The matrix and customer data are placed once in shared memory for all
+    workers; each worker rebuilds and compiles the instance once per solve.
+    """
+
+    epochs = 4
+
+    def __init__(self, solver_cls: type[Solver], n_islands: int):
+        self.solver_cls = solver_cls
+        self.n_islands = max(1, int(n_islands))
+        self.name = f"{solver_cls.name}@{self.n_islands}"
+
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
+        ci = ensure_compiled(g, instance, compiled)
+        start = time.time()
+        streams = np.random.SeedSequence(int(rng.integers(2**63))).spawn(self.n_islands)
+        plans: list[FlatRoutePlan | None] = [initial.to_flat() if initial is not None else None] * self.n_islands
+        costs = [np.inf] * self.n_islands
+        trace = self.trace()
+        evals = 0
+        shm, spec, head = _share_problem(ci)
+        try:
+            pool = _pool(self.n_islands)
+            for epoch in range(self.epochs):
+                offset = time.time() - start
+                slice_s = max(0.0, (time_limit_s - offset) / (self.epochs - epoch))
+                knobs = {"stall_s": self.stall_s, "stall_evals": self.stall_evals, "start_s": self.start_s}
+                try:
+                    futures = [
+                        pool.submit(_run_island, self.solver_cls, shm.name, spec, head, s.spawn(1)[0], slice_s, plans[i], knobs)
+                        for i, s in enumerate(streams)
+                    ]
+                    results = [f.result() for f in futures]
+                except Exception:
+                    _discard_pool(self.n_islands)
+                    raise
+                plans = [r for r, _, _ in results]
+                costs = [c for _, c, _ in results]
+                # Islands run side by side: merge their curves on the wall clock, evaluations summed per epoch.
+                points = sorted((p for _, _, meta in results for p in meta.get("trace", [])), key=lambda p: p[0])
+                trace.extend(points, offset, evals)
+                evals += sum(int(meta.get("evaluations", 0)) for _, _, meta in results)
+                trace.update(evals, min(costs))
+                if epoch + 1 < self.epochs:
+                    order = [(i - 1) % self.n_islands for i in range(self.n_islands)]
+                    plans = [plans[i] if costs[i] <= costs[j] else plans[j] for i, j in zip(range(self.n_islands), order)]
+        finally:
+            shm.close()
+            shm.unlink()
+        best = int(np.argmin(costs))
+        return RoutePlan(
+            routes=plans[best].routes,
+            meta={
+                "islands": self.n_islands,
+                "epochs": self.epochs,
+                "island_costs": [float(c) for c in costs],
+                "evaluations": evals,
+                "trace": trace.points,
+            },
+        )
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+from chandisvrp.instances.compiled import CompiledInstance
+from chandisvrp.solvers.route_opt import neighbor_lists, optimize_route
+from chandisvrp.solvers.route_state import RouteState
+
+
+class _InsertionCache:
+    """Three cheapest insertion slots of a point into a route, kept until that route changes."""
+
+    def __init__(self, state: RouteState):
+        self.state = state
+        self._slots: dict[tuple[int, int], tuple[int, list[tuple[float, int, int]]]] = {}
+
+    def top3(self, u: int, k: int) -> list[tuple[float, int, int]]:
+        st = self.state
+        hit = self._slots.get((u, k))
+        if hit is not None and hit[0] == st.version[k]:
+            return hit[1]
+        t = np.array([0, *st.routes[k], 0], dtype=np.int64)
+        a, b = t[:-1], t[1:]
+        uu = np.full(a.size, u, dtype=np.int64)
+        cost = np.asarray(st.dist[a, uu], dtype=float) + np.asarray(st.dist[uu, b], dtype=float) - np.asarray(st.dist[a, b], dtype=float)
+        best = np.argsort(cost)[:3]
+        slots = [(float(cost[s]), int(a[s]), int(b[s])) for s in best.tolist()]
+        self._slots[(u, k)] = (st.version[k], slots)
+        return slots
+
+
+def local_search(
+    state: RouteState,
+    neighbors: dict[int, list[int]],
+    time_limit_s: float = math.inf,
+    intra: bool = True,
+    eps: float = 1e-9,
+) -> RouteState:
+    """Granular inter-route descent: relocate, exchange, 2-opt* and swap* over neighbor lists.
+
+    Moves are priced in O(1) from the cached route loads, prefix loads and costs in ``state``
+    (swap* through cached top-3 insertion slots); only applied moves rebuild the two routes
+    involved. With ``intra`` each changed route is then polished with 2-opt/Or-opt, and the
+    descent repeats until neither phase improves or the time budget runs out.
+    """
+    deadline = time.time() + time_limit_s
+    st = state
+    dem = st.demand
+    cap = st.capacity
+    d = st.dist.item if isinstance(st.dist, np.ndarray) else (lambda i, j: float(st.dist[i, j]))
+    cache = _InsertionCache(st)
+    active = deque(p for r in st.routes for p in r)
+    queued = set(active)
+    touched: set[int] = set()
+
+    def wake(*points: int) -> None:
+        for p in points:
+            if p and p not in queued:
+                queued.add(p)
+                active.append(p)
+
+    def without(k: int, p: int) -> list[int]:
+        r = st.routes[k]
+        i = st.pos_of[p]
+        return r[:i] + r[i + 1 :]
+
+    def insert_after(route: list[int], a: int, p: int) -> list[int]:
+        i = route.index(a) + 1 if a else 0
+        return route[:i] + [p] + route[i:]
+
+    def commit(changes: dict[int, list[int]], *woken: int) -> None:
+        for k, r in changes.items():
+            st.set_route(k, r)
+            touched.add(k)
+        wake(*woken)
+
+    def try_moves(u: int) -> bool:
+        ru = st.route_of[u]
+        pu, su = st.around(u)
+        rem_u = d(pu, su) - d(pu, u) - d(u, su)
+        for v in neighbors.get(u, ()):
+            rv = st.route_of[v]
+            if rv == ru or rv < 0:
+                continue
+            pv, sv = st.around(v)
+            # Relocate u right after v (arc v -> u) or right before it (arc u -> v).
+            if st.loads[rv] + dem[u] <= cap:
+                if d(v, u) + d(u, sv) - d(v, sv) + rem_u < -eps:
+                    commit({ru: without(ru, u), rv: insert_after(st.routes[rv], v, u)}, u, v, pu, su, sv)
+                    return True
+                if d(pv, u) + d(u, v) - d(pv, v) + rem_u < -eps:
+                    commit({ru: without(ru, u), rv: insert_after(st.routes[rv], pv, u)}, u, v, pu, su, pv)
+                    return True
+            # Exchange u with v's successor or predecessor, so u lands next to v.
+            for w in (sv, pv):
+                if w:
+                    delta = st.swap_delta(u, w)
+                    if delta is not None and delta < -eps:
+                        st.apply_swap(u, w)
+                        touched.update((ru, rv))
+                        wake(u, w, v, pu, su, *st.around(u))
+                        return True
+            # 2-opt*: swap route tails so that u -> v (or v -> u) becomes an arc.
+            iu, iv = st.pos_of[u], st.pos_of[v]
+            head_u, head_v = st.prefix_load(ru, iu), st.prefix_load(rv, iv - 1)
+            if (
+                head_u + st.loads[rv] - head_v <= cap
+                and head_v + st.loads[ru] - head_u <= cap
+                and d(u, v) + d(pv, su) - d(u, su) - d(pv, v) < -eps
+            ):
+                r_u, r_v = st.routes[ru], st.routes[rv]
+                commit({ru: r_u[: iu + 1] + r_v[iv:], rv: r_v[:iv] + r_u[iu + 1 :]}, u, v, su, pv)
+                return True
+            head_u, head_v = st.prefix_load(ru, iu - 1), st.prefix_load(rv, iv)
+            if (
+                head_v + st.loads[ru] - head_u <= cap
+                and head_u + st.loads[rv] - head_v <= cap
+                and d(v, u) + d(pu, sv) - d(v, sv) - d(pu, u) < -eps
+            ):
+                r_u, r_v = st.routes[ru], st.routes[rv]
+                commit({rv: r_v[: iv + 1] + r_u[iu:], ru: r_u[:iu] + r_v[iv + 1 :]}, u, v, sv, pu)
+                return True
+            # swap*: exchange u and v, each re-inserted at its best slot in the other route.
+            if st.loads[ru] - dem[u] + dem[v] <= cap and st.loads[rv] - dem[v] + dem[u] <= cap:
+                rem_v = d(pv, sv) - d(pv, v) - d(v, sv)
+                ins_u = min(
+                    [(d(pv, u) + d(u, sv) - d(pv, sv), pv)]
+                    + [(c, a) for c, a, b in cache.top3(u, rv) if v not in (a, b)]
+                )
+                ins_v = min(
+                    [(d(pu, v) + d(v, su) - d(pu, su), pu)]
+                    + [(c, a) for c, a, b in cache.top3(v, ru) if u not in (a, b)]
+                )
+                if rem_u + rem_v + ins_u[0] + ins_v[0] < -eps:
+                    commit(
+                        {
+                            ru: insert_after(without(ru, u), ins_v[1], v),
+                            rv: insert_after(without(rv, v), ins_u[1], u),
+                        },
+                        u, v, pu, su, pv, sv, ins_u[1], ins_v[1],
+                    )
+                    return True
+        return False
+
+    while True:
+        while active and time.time() < deadline:
+            u = active.popleft()
+            queued.discard(u)
+            if try_moves(u):
+                wake(u)
+        if not intra or time.time() >= deadline or not touched:
+            break
+        improved = False
+        for k in sorted(touched):
+            before = st.costs[k]
+            r = optimize_route(st.routes[k], st.dist, neighbors)
+            if r != st.routes[k]:
+                st.set_route(k, r)
+                if st.costs[k] < before - eps:
+                    improved = True
+                    wake(*r)
+        touched.clear()
+        if not improved:
+            break
+    return st
+
+
+def improve_routes(
+    ci: CompiledInstance,
+    routes: list[list[int]],
+    time_limit_s: float,
+    n_neighbors: int = 16,
+    neighbors: dict[int, list[int]] | None = None,
+) -> list[list[int]]:
+    """Run ``local_search`` on point routes of ``ci`` and return the non-empty improved routes."""
+    if neighbors is None:
+        neighbors = neighbor_lists(ci.length_m, n_neighbors)
+    state = RouteState(routes, ci.length_m, ci.demand, ci.capacity, ci.route_cache)
+    state = local_search(state, neighbors, time_limit_s)
+    return [r for r in state.routes if r]
@@ -3,9 +3,81 @@ from __future__ import annotations
 import numpy as np
 
 
-def random_destroy(routes: list[list[int]], rng: np.random.Generator, fraction: float = 0.2) -> tuple[list[list[int]], list[int]]:
+def _without(routes: list[list[int]], removed: list[int]) -> list[list[int]]:
+    # Routes that lose nothing are passed through as the same list objects.
+    gone = set(removed)
+    out = []
+    for r in routes:
+        if gone.isdisjoint(r):
+            out.append(r)
+        else:
+            kept = [c for c in r if c not in gone]
+            if kept:
+                out.append(kept)
+    return out
+
+
+def random_destroy(
+    routes: list[list[int]], rng: np.random.Generator, fraction: float = 0.2, size: int | None = None
+) -> tuple[list[list[int]], list[int]]:
     flat = [c for r in routes for c in r]
-    k = max(1, int(len(flat) * fraction))
-    removed = list(rng.choice(flat, size=min(k, len(flat)), replace=False))
-    new_routes = [[c for c in r if c not in removed] for r in routes]
-    return [r for r in new_routes if r], removed
+    k = size if size is not None else max(1, int(len(flat) * fraction))
+    removed = rng.choice(flat, size=min(k, len(flat)), replace=False).tolist()
+    return _without(routes, removed), removed
+
+
+def worst_destroy(
+    routes: list[list[int]], rng: np.random.Generator, size: int, dist, noise: float = 3.0
+) -> tuple[list[list[int]], list[int]]:
+    """Remove the customers whose detour costs most, with a Ropke-Pisinger randomised rank."""
+    flat = np.array([c for r in routes for c in r], dtype=np.int64)
+    prev = np.concatenate([np.concatenate([[0], r[:-1]]) for r in routes if r]).astype(np.int64)
+    succ = np.concatenate([np.concatenate([r[1:], [0]]) for r in routes if r]).astype(np.int64)
+    gain = (
+        np.asarray(dist[prev, flat], dtype=float)
+        + np.asarray(dist[flat, succ], dtype=float)
+        - np.asarray(dist[prev, succ], dtype=float)
+    )
+    order = np.argsort(-gain)
+    size = min(size, flat.size)
+    removed: list[int] = []
+    taken = np.zeros(flat.size, dtype=bool)
+    for _ in range(size):
+        left = order[~taken[order]]
+        pick = left[int(rng.random() ** noise * left.size)]
+        taken[pick] = True
+        removed.append(int(flat[pick]))
+    return _without(routes, removed), removed
+
+
+def shaw_destroy(
+    routes: list[list[int]], rng: np.random.Generator, size: int, neighbors: dict[int, list[int]]
+) -> tuple[list[list[int]], list[int]]:
+    """Related removal: grow the removed set through the neighbor lists of already removed customers."""
+    flat = [c for r in routes for c in r]
+    size = min(size, len(flat))
+    removed = [flat[int(rng.integers(len(flat)))]]
+    gone = set(removed)
+    while len(removed) < size:
+        anchor = removed[int(rng.integers(len(removed)))]
+        nxt = next((v for v in neighbors.get(anchor, ()) if v not in gone), None)
+        if nxt is None:
+            nxt = next(c for c in rng.permutation(flat).tolist() if c not in gone)
+        removed.append(nxt)
+        gone.add(nxt)
+    return _without(routes, removed), removed
+
+
+def route_destroy(
+    routes: list[list[int]], rng: np.random.Generator, size: int
+) -> tuple[list[list[int]], list[int]]:
+    """Empty whole routes, picked at random, until at least ``size`` customers are out."""
+    order = rng.permutation(len(routes)).tolist()
+    removed: list[int] = []
+    dropped = set()
+    for k in order:
+        if len(removed) >= size:
+            break
+        removed.extend(routes[k])
+        dropped.add(k)
+    return [r for k, r in enumerate(routes) if k not in dropped], removed
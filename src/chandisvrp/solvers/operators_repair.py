@@ -11,3 +11,91 @@ def greedy_repair(routes: list[list[int]], removed: list[int], rng: np.random.Ge
         pos = int(rng.integers(0, len(routes[idx]) + 1))
         routes[idx].insert(pos, c)
     return routes
+
+
+def _slot_costs(pending: np.ndarray, a: np.ndarray, b: np.ndarray, dist) -> np.ndarray:
+    # Cost of putting each pending customer on each arc a -> b: shape (len(pending), len(a)).
+    return (
+        np.asarray(dist[np.ix_(a, pending)], dtype=float).T
+        + np.asarray(dist[np.ix_(pending, b)], dtype=float)
+        - np.asarray(dist[a, b], dtype=float)[None, :]
+    )
+
+
+def _insertion_column(route: list[int], pending: np.ndarray, dist) -> tuple[np.ndarray, np.ndarray]:
+    # Cheapest slot of every pending customer in one route: cost (len(pending),) and slot index.
+    t = np.array([0, *route, 0], dtype=np.int64)
+    cost = _slot_costs(pending, t[:-1], t[1:], dist)
+    slot = cost.argmin(axis=1)
+    return cost[np.arange(pending.size), slot], slot
+
+
+def _insertion_table(routes: list[list[int]], pending: np.ndarray, dist) -> tuple[np.ndarray, np.ndarray]:
+    # All routes at once: one gather over every arc, then per-route minima with reduceat.
+    if not routes:
+        return np.empty((pending.size, 0)), np.empty((pending.size, 0), dtype=np.int64)
+    a = np.concatenate([np.array([0, *r], dtype=np.int64) for r in routes])
+    b = np.concatenate([np.array([*r, 0], dtype=np.int64) for r in routes])
+    starts = np.zeros(len(routes), dtype=np.int64)
+    np.cumsum([len(r) + 1 for r in routes[:-1]], out=starts[1:])
+    cost = _slot_costs(pending, a, b, dist)
+    best = np.minimum.reduceat(cost, starts, axis=1)
+    seg = np.repeat(np.arange(len(routes)), np.diff(np.append(starts, a.size)))
+    idx = np.where(cost == best[:, seg], np.arange(a.size)[None, :], a.size)
+    return best, np.minimum.reduceat(idx, starts, axis=1) - starts[None, :]
+
+
+def regret_repair(
+    routes: list[list[int]],
+    removed: list[int],
+    dist,
+    demand: np.ndarray,
+    capacity: int,
+    k: int = 2,
+) -> list[list[int]]:
+    """Regret-k insertion (k = 1 is plain greedy); opens a new route when nothing fits.
+
+    Best slot costs are cached per (customer, route) and only the column of the route that
+    just received a customer is recomputed. Untouched routes keep their list objects.
+    """
+    routes = list(routes)
+    pending = np.array(removed, dtype=np.int64)
+    if pending.size == 0:
+        return routes
+    dem = demand[pending]
+    loads = np.array([int(demand[r].sum()) if r else 0 for r in routes], dtype=np.int64)
+    cost, slot = _insertion_table(routes, pending, dist)
+    solo = np.asarray(dist[np.zeros_like(pending), pending], dtype=float) + np.asarray(dist[pending, np.zeros_like(pending)], dtype=float)
+    open_ = np.ones(pending.size, dtype=bool)
+    while open_.any():
+        options = np.where(loads[None, :] + dem[:, None] <= capacity, cost, np.inf)
+        options = np.concatenate([options, solo[:, None]], axis=1)
+        ranked = np.sort(options, axis=1)[:, : max(k, 1)]
+        if k > 1:
+            # A customer with a single feasible option has infinite regret.
+            with np.errstate(invalid="ignore"):
+                regret = (ranked[:, 1:] - ranked[:, :1]).sum(axis=1)
+            regret[np.isnan(regret)] = np.inf
+            # Highest regret first; ties go to the cheaper insertion.
+            priority = np.where(open_, regret, -np.inf)
+            best = np.flatnonzero(priority == priority.max())
+            u = int(best[np.argmin(ranked[best, 0])])
+        else:
+            u = int(np.argmin(np.where(open_, ranked[:, 0], np.inf)))
+        target = int(np.argmin(options[u]))
+        open_[u] = False
+        p = int(pending[u])
+        if target == len(routes):
+            routes.append([p])
+            loads = np.append(loads, dem[u])
+            cost = np.concatenate([cost, np.zeros((pending.size, 1))], axis=1)
+            slot = np.concatenate([slot, np.zeros((pending.size, 1), dtype=np.int64)], axis=1)
+        else:
+            r = routes[target]
+            i = int(slot[u, target])
+            routes[target] = r[:i] + [p] + r[i:]
+            loads[target] += dem[u]
+        if open_.any():
+            c, s = _insertion_column(routes[target], pending, dist)
+            cost[:, target], slot[:, target] = c, s
+    return routes
@@ -1,62 +1,135 @@
 from __future__ import annotations
 
+import math
+
 import networkx as nx
 import numpy as np
 
-from chandisvrp.solvers.constructive import NearestNeighbor2OptSolver
+from chandisvrp.instances.compiled import CompiledInstance, ensure_compiled
 from chandisvrp.solvers.base import Solver
+from chandisvrp.solvers.constructive import NearestNeighbor2OptSolver
 from chandisvrp.types import Instance, RoutePlan
 
 
 class OrtoolsSolver(Solver):
+    """VRPTW on OR-Tools with natively registered integer matrices.
+
+    Arc costs are rounded metres. A time dimension carries travel plus service time from the
+    depot departure at ``start_s``; arriving early waits, arriving after ``tw_end_s`` is a soft
+    violation costing ``late_cost_per_s``. An ``initial`` plan is loaded as the first assignment.
+
+    The instance fleet is a hard limit. With ``grow_fleet`` the model may add vehicles until the
+    total demand (and the warm start) fits; ``vehicles_added`` in the meta says how many.
+    """
+
     name = "ortools"
+    metaheuristic = "GUIDED_LOCAL_SEARCH"
+    horizon_s = 2 * 24 * 3600
+    late_cost_per_s = 1
+    grow_fleet = False
 
-    def solve(self, g: nx.MultiDiGraph, instance: Instance, rng: np.random.Generator, time_limit_s: float) -> RoutePlan:
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
+        trace = self.trace()
+        ci = ensure_compiled(g, instance, compiled)
         try:
             from ortools.constraint_solver import pywrapcp, routing_enums_pb2
         except Exception:
-            return NearestNeighbor2OptSolver().solve(g, instance, rng, time_limit_s)
+            return NearestNeighbor2OptSolver().solve(g, instance, rng, time_limit_s, compiled=ci, initial=initial)
 
-        n = len(instance.customers)
-        nodes = [instance.depot_node] + [c.node for c in instance.customers]
-        demands = [0] + [c.demand for c in instance.customers]
+        n = ci.n_customers
+        warm = ci.to_point_routes(initial.routes) if initial is not None else []
+        warm = [r for r in warm if r]
+        fleet = max(instance.n_vehicles, 1)
+        n_vehicles = fleet
+        if self.grow_fleet:
+            n_vehicles = max(fleet, math.ceil(int(ci.demand.sum()) / ci.capacity), len(warm))
+        if len(warm) > n_vehicles:
+            warm = []
 
-        manager = pywrapcp.RoutingIndexManager(n + 1, instance.n_vehicles, 0)
-        routing = pywrapcp.RoutingModel(manager)
+        # One fancy-indexed read per quantity; on a tiled matrix it touches only the instance's tiles.
+        ix = np.ix_(ci.rows, ci.rows)
+        length = np.asarray(ci.matrix.length_m[ix], dtype=float)
+        dist = np.rint(length).astype(np.int64)
+        transit = np.rint(np.asarray(ci.matrix.time_s[ix], dtype=float) + ci.service_s[:, None]).astype(np.int64)
+        np.minimum(transit, self.horizon_s, out=transit)
 
-        def dist_cb(i: int, j: int) -> int:
-            ni, nj = nodes[manager.IndexToNode(i)], nodes[manager.IndexToNode(j)]
-            if g.has_edge(ni, nj):
-                data = next(iter(g.get_edge_data(ni, nj).values()))
-                return int(data.get("length_m", data.get("length", 500)))
-            return 1000
-
-        dist_idx = routing.RegisterTransitCallback(dist_cb)
+        manager = pywrapcp.RoutingIndexManager(n + 1, n_vehicles, 0)
+        routing = pywrapcp.RoutingModel(manager)
+        dist_idx = routing.RegisterTransitMatrix(dist.tolist())
         routing.SetArcCostEvaluatorOfAllVehicles(dist_idx)
+        demand_idx = routing.RegisterUnaryTransitVector(ci.demand.astype(np.int64).tolist())
+        routing.AddDimensionWithVehicleCapacity(demand_idx, 0, [ci.capacity] * n_vehicles, True, "Capacity")
 
-        def demand_cb(i: int) -> int:
-            return int(demands[manager.IndexToNode(i)])
-
-        demand_idx = routing.RegisterUnaryTransitCallback(demand_cb)
-        routing.AddDimensionWithVehicleCapacity(demand_idx, 0, [instance.vehicle_capacity] * instance.n_vehicles, True, "Capacity")
+        time_idx = routing.RegisterTransitMatrix(transit.tolist())
+        routing.AddDimension(time_idx, self.horizon_s, self.horizon_s, False, "Time")
+        time_dim = routing.GetDimensionOrDie("Time")
+        for v in range(n_vehicles):
+            time_dim.CumulVar(routing.Start(v)).SetValue(int(self.start_s))
+        for p in range(1, n + 1):
+            idx = manager.NodeToIndex(p)
+            lo, hi = ci.tw_start_s[p], ci.tw_end_s[p]
+            time_dim.CumulVar(idx).SetMin(int(min(lo, self.horizon_s)))
+            if hi < self.horizon_s:
+                time_dim.SetCumulVarSoftUpperBound(idx, int(hi), self.late_cost_per_s)
 
         params = pywrapcp.DefaultRoutingSearchParameters()
         params.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
-        params.time_limit.seconds = max(1, int(time_limit_s))
-        solution = routing.SolveWithParameters(params)
+        params.local_search_metaheuristic = getattr(routing_enums_pb2.LocalSearchMetaheuristic, self.metaheuristic)
+        params.time_limit.FromMilliseconds(max(1, int(time_limit_s * 1000)))
+
+        found = 0
+        best_objective = math.inf
+        # Incumbents are ranked by the objective (which includes lateness penalties) but traced by
+        # route length, the unit every other solver reports.
+        node_of = np.array([manager.IndexToNode(i) for i in range(routing.Size() + n_vehicles)], dtype=np.int64)
+        from_nodes = node_of[: routing.Size()]
+
+        def on_solution() -> None:
+            nonlocal found, best_objective
+            found += 1
+            objective = routing.CostVar().Max()
+            if objective < best_objective:
+                best_objective = objective
+                nxt = np.array([routing.NextVar(i).Value() for i in range(routing.Size())], dtype=np.int64)
+                trace.record(found, float(length[from_nodes, node_of[nxt]].sum()))
+
+        routing.AddAtSolutionCallback(on_solution)
+        start = None
+        if warm:
+            routing.CloseModelWithParameters(params)
+            start = routing.ReadAssignmentFromRoutes(warm + [[]] * (n_vehicles - len(warm)), True)
+        if start is not None:
+            solution = routing.SolveFromAssignmentWithParameters(start, params)
+        else:
+            solution = routing.SolveWithParameters(params)
         if solution is None:
-            return NearestNeighbor2OptSolver().solve(g, instance, rng, time_limit_s)
+            return NearestNeighbor2OptSolver().solve(g, instance, rng, time_limit_s, compiled=ci, initial=initial)
 
         routes: list[list[int]] = []
-        for v in range(instance.n_vehicles):
-            idx = routing.Start(v)
+        for v in range(n_vehicles):
+            idx = solution.Value(routing.NextVar(routing.Start(v)))
             route: list[int] = []
             while not routing.IsEnd(idx):
-                node = manager.IndexToNode(idx)
-                if node != 0:
-                    route.append(node)
+                route.append(manager.IndexToNode(idx))
                 idx = solution.Value(routing.NextVar(idx))
             if route:
                 routes.append(route)
-        mapped = [[instance.customers[i - 1].customer_id for i in r] for r in routes]
-        return RoutePlan(routes=mapped)
+        return RoutePlan(
+            routes=ci.to_id_routes(routes),
+            meta={
+                "objective": int(solution.ObjectiveValue()),
+                "vehicles": n_vehicles,
+                "vehicles_added": n_vehicles - fleet,
+                "warm_start": start is not None,
+                "evaluations": found,
+                "trace": trace.points,
+            },
+        )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+
+import networkx as nx
+import numpy as np
+
+from chandisvrp.instances.compiled import CompiledInstance, ensure_compiled
+from chandisvrp.solvers.base import Solver
+from chandisvrp.solvers.constructive import nearest_neighbor_order, plan_length
+from chandisvrp.solvers.local_search import improve_routes
+from chandisvrp.solvers.split import split_points
+from chandisvrp.types import Instance, RoutePlan
+
+
+class LocalSearchSolver(Solver):
+    """Granular local search on ``initial`` (or a nearest-neighbour split) for the whole budget."""
+
+    name = "ls"
+    n_neighbors = 16
+
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
+        trace = self.trace()
+        ci = ensure_compiled(g, instance, compiled)
+        if initial is not None:
+            routes = ci.to_point_routes(initial.routes)
+        else:
+            routes = split_points(nearest_neighbor_order(ci), ci.demand, ci.capacity)
+        cache = ci.route_cache
+        cache_before = cache.stats()
+        trace.update(0, sum(cache(r) for r in routes))
+        routes = improve_routes(ci, routes, time_limit_s, n_neighbors=self.n_neighbors)
+        trace.update(1, sum(cache(r) for r in routes))
+        meta = {"trace": trace.points, "route_cache": cache.stats_since(cache_before)}
+        return RoutePlan(routes=ci.to_id_routes(routes), meta=meta)
+
+
+class PipelineSolver(Solver):
+    """Runs ``stages`` in order, each warm-started from the previous stage's plan.
+
+    Every stage gets an equal share of the time that is still left, so a constructive stage
+    that returns early hands its unused budget to the stages after it.
+    """
+
+    def __init__(self, stages: list[Solver]):
+        self.stages = stages
+        self.name = ">".join(s.name for s in stages)
+
+    def solve(
+        self,
+        g: nx.MultiDiGraph,
+        instance: Instance,
+        rng: np.random.Generator,
+        time_limit_s: float,
+        compiled: CompiledInstance | None = None,
+        initial: RoutePlan | None = None,
+    ) -> RoutePlan:
+        ci = ensure_compiled(g, instance, compiled)
+        trace = self.trace()
+        plan = initial
+        stages = []
+        evals = 0
+        for i, solver in enumerate(self.stages):
+            t = time.time()
+            left = max(0.0, time_limit_s - (t - trace.start))
+            plan = solver.solve(g, instance, rng, left / (len(self.stages) - i), compiled=ci, initial=plan)
+            meta = dict(plan.meta)
+            trace.extend(meta.pop("trace", []), t - trace.start, evals)
+            evals += int(meta.get("evaluations", 0))
+            trace.update(evals, plan_length(ci, plan.routes))
+            stages.append({"name": solver.name, "time_s": round(time.time() - t, 3), **meta})
+        return RoutePlan(routes=plan.routes, meta={"stages": stages, "evaluations": evals, "trace": trace.points})
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import numpy as np
+
+from chandisvrp.solvers.constructive import route_length
+
+
+class RouteCostCache:
+    """Closed-route lengths memoised by customer sequence, evicting the least recently used.
+
+    Keys are the route tuples themselves, so a lookup is one C-level tuple hash and there are
+    no collisions to guard against; ``maxsize`` bounds memory on long runs.
+    """
+
+    def __init__(self, dist: np.ndarray, maxsize: int = 1 << 16):
+        self.dist = dist
+        self.maxsize = int(maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._costs: OrderedDict[tuple[int, ...], float] = OrderedDict()
+
+    def __call__(self, route: list[int]) -> float:
+        key = tuple(route)
+        cost = self._costs.get(key)
+        if cost is not None:
+            self.hits += 1
+            self._costs.move_to_end(key)
+            return cost
+        self.misses += 1
+        cost = route_length(route, self.dist)
+        self._costs[key] = cost
+        if len(self._costs) > self.maxsize:
+            self._costs.popitem(last=False)
+        return cost
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._costs)}
+
+    def stats_since(self, before: dict[str, int]) -> dict[str, int]:
+        """``stats()`` with hits and misses counted from the ``before`` snapshot on."""
+        now = self.stats()
+        return {**now, "hits": now["hits"] - before["hits"], "misses": now["misses"] - before["misses"]}
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections import deque
+
+import numpy as np
+
+
+def nearest_matrix(dist, k: int, rows: np.ndarray, cols: np.ndarray, block: int = 512) -> np.ndarray:
+    """``(len(rows), k)`` array of the ``k`` closest ``cols`` to each row (outgoing distance), nearest first.
+
+    A point is never its own neighbor; rows are processed in blocks to bound memory.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    out = np.empty((rows.size, k), dtype=np.int64)
+    for s in range(0, rows.size, block):
+        r = rows[s : s + block]
+        d = np.array(dist[np.ix_(r, cols)], dtype=float)
+        d[r[:, None] == cols[None, :]] = np.inf
+        near = np.argpartition(d, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(d, near, axis=1).argsort(axis=1)
+        out[s : s + r.size] = cols[np.take_along_axis(near, order, axis=1)]
+    return out
+
+
+def neighbor_lists(dist, k: int, points: np.ndarray | None = None, block: int = 512) -> dict[int, list[int]]:
+    """``k`` closest other points for each point (outgoing distance), computed in row blocks."""
+    pts = np.arange(1, dist.shape[0]) if points is None else np.asarray(points, dtype=np.int64)
+    k = min(k, pts.size - 1)
+    if k <= 0:
+        return {int(p): [] for p in pts}
+    return dict(zip(pts.tolist(), nearest_matrix(dist, k, pts, pts, block).tolist()))
+
+
+class _Tour:
+    """Depot-closed tour ``[0, *route, 0]`` with forward/backward arc prefix sums.
+
+    Reversing positions ``i..j`` flips the direction of every inner arc, which on an asymmetric
+    matrix is ``B[j] - B[i] - (F[j] - F[i])``, so both kinds of move are priced in O(1).
+    """
+
+    def __init__(self, route: list[int], dist):
+        self.dist = dist
+        # ndarray.item skips building a numpy scalar, which dominates the per-candidate cost.
+        self.d = dist.item if isinstance(dist, np.ndarray) else lambda u, v: float(dist[u, v])
+        self.t = [0, *route, 0]
+        self.pos = {p: i for i, p in enumerate(self.t[1:-1], start=1)}
+        self._refresh()
+
+    def _refresh(self) -> None:
+        t = np.asarray(self.t, dtype=np.int64)
+        f = np.zeros(t.size)
+        b = np.zeros(t.size)
+        np.cumsum(np.asarray(self.dist[t[:-1], t[1:]], dtype=float), out=f[1:])
+        np.cumsum(np.asarray(self.dist[t[1:], t[:-1]], dtype=float), out=b[1:])
+        self.F, self.B = f.tolist(), b.tolist()
+
+    def reverse_delta(self, i: int, j: int) -> float:
+        t = self.t
+        return (
+            self.d(t[i - 1], t[j])
+            + self.d(t[i], t[j + 1])
+            - self.d(t[i - 1], t[i])
+            - self.d(t[j], t[j + 1])
+            + (self.B[j] - self.B[i])
+            - (self.F[j] - self.F[i])
+        )
+
+    def reverse(self, i: int, j: int) -> None:
+        t = self.t
+        t[i : j + 1] = t[i : j + 1][::-1]
+        for q in range(i, j + 1):
+            self.pos[t[q]] = q
+        self._refresh()
+
+    def move_delta(self, i: int, length: int, g: int) -> float:
+        # Segment t[i:i+length] re-inserted, unreversed, between t[g] and t[g+1].
+        t = self.t
+        s0, se = t[i], t[i + length - 1]
+        prev, nxt = t[i - 1], t[i + length]
+        removed = self.d(prev, s0) + self.d(se, nxt) - self.d(prev, nxt)
+        return self.d(t[g], s0) + self.d(se, t[g + 1]) - self.d(t[g], t[g + 1]) - removed
+
+    def move(self, i: int, length: int, g: int) -> None:
+        t = self.t
+        seg = t[i : i + length]
+        if g < i:
+            t[g + 1 : i + length] = seg + t[g + 1 : i]
+            lo, hi = g + 1, i + length
+        else:
+            t[i : g + 1] = t[i + length : g + 1] + seg
+            lo, hi = i, g + 1
+        for q in range(lo, hi):
+            self.pos[t[q]] = q
+        self._refresh()
+
+    @property
+    def route(self) -> list[int]:
+        return self.t[1:-1]
+
+
+def optimize_route(
+    route: list[int], dist, neighbors: dict[int, list[int]] | None = None, or_opt_max: int = 3, eps: float = 1e-9
+) -> list[int]:
+    """2-opt plus Or-opt on one depot route, restricted to neighbor lists, driven by don't-look bits.
+
+    Every candidate is priced in O(1); only applied moves touch the route. Without ``neighbors``
+    each point considers every other point of the route.
+    """
+    if len(route) < 2:
+        return list(route)
+    tour = _Tour(route, dist)
+    pos = tour.pos
+    active = deque(tour.route)
+    queued = set(active)
+
+    def wake(*points: int) -> None:
+        for p in points:
+            if p and p not in queued:
+                queued.add(p)
+                active.append(p)
+
+    def candidates(u: int) -> list[int]:
+        # Neighbor positions in this route; the depot is always a candidate, at both ends.
+        vs = neighbors.get(u, []) if neighbors is not None else tour.t[1:-1]
+        return [0, len(tour.t) - 1, *(q for q in map(pos.get, vs) if q is not None)]
+
+    def try_two_opt(u: int) -> bool:
+        p = pos[u]
+        t = tour.t
+        for q in candidates(u):
+            # Reversing i..j creates arcs t[i-1] -> t[j] and t[i] -> t[j+1]; u can take any end.
+            for i, j in ((p + 1, q), (q + 1, p), (p, q - 1), (q, p - 1)):
+                if not 1 <= i < j < len(t) - 1 or tour.reverse_delta(i, j) >= -eps:
+                    continue
+                ends = (t[i - 1], t[i], t[j], t[j + 1])
+                tour.reverse(i, j)
+                wake(*ends)
+                return True
+        return False
+
+    def try_or_opt(u: int) -> bool:
+        i = pos[u]
+        t = tour.t
+        m = len(t) - 2
+        for length in range(1, min(or_opt_max, m - i + 1) + 1):
+            se = t[i + length - 1]
+            # Re-insert right after a neighbor of u (arc v -> u) or right before one of se (arc se -> w).
+            gs = [q for q in candidates(u) if q <= m] + [q - 1 for q in candidates(se) if q >= 1]
+            for g in gs:
+                if i - 1 <= g <= i + length - 1 or tour.move_delta(i, length, g) >= -eps:
+                    continue
+                ends = (t[i - 1], t[i + length], t[g], t[g + 1])
+                tour.move(i, length, g)
+                wake(u, se, *ends)
+                return True
+        return False
+
+    while active:
+        u = active.popleft()
+        queued.discard(u)
+        if try_two_opt(u) or try_or_opt(u):
+            wake(u)
+    return tour.route
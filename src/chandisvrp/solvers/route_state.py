@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import numpy as np
+
+from chandisvrp.solvers.route_cache import RouteCostCache
+
+
+class RouteState:
+    """Point routes with cached per-route loads and costs, so a customer swap is priced in O(1).
+
+    Only the (at most four) arcs around the two swapped positions change, and a swap between
+    routes only moves ``demand[b] - demand[a]`` of load, so neither route has to be re-walked.
+    """
+
+    def __init__(
+        self,
+        routes: list[list[int]],
+        dist: np.ndarray,
+        demand: np.ndarray,
+        capacity: int,
+        cache: RouteCostCache | None = None,
+    ):
+        self.dist = dist
+        self.cache = cache if cache is not None else RouteCostCache(dist)
+        self.demand = demand.tolist()
+        self.capacity = int(capacity)
+        self.routes = [list(r) for r in routes]
+        n_points = len(self.demand)
+        self.route_of = [-1] * n_points
+        self.pos_of = [-1] * n_points
+        for k, r in enumerate(self.routes):
+            for i, p in enumerate(r):
+                self.route_of[p] = k
+                self.pos_of[p] = i
+        self.loads = [sum(self.demand[p] for p in r) for r in self.routes]
+        self.costs = [self.cache(r) for r in self.routes]
+        self.total = float(sum(self.costs))
+        self.version = [0] * len(self.routes)
+        self._prefix: dict[int, list[int]] = {}
+
+    def around(self, p: int) -> tuple[int, int]:
+        r = self.routes[self.route_of[p]]
+        i = self.pos_of[p]
+        return (r[i - 1] if i > 0 else 0), (r[i + 1] if i + 1 < len(r) else 0)
+
+    def _swap_deltas(self, a: int, b: int) -> tuple[float, float]:
+        d = self.dist
+        pa, sa = self.around(a)
+        pb, sb = self.around(b)
+        if self.route_of[a] == self.route_of[b]:
+            if sa == b:
+                return float(d[pa, b] + d[b, a] + d[a, sb] - d[pa, a] - d[a, b] - d[b, sb]), 0.0
+            if sb == a:
+                return float(d[pb, a] + d[a, b] + d[b, sa] - d[pb, b] - d[b, a] - d[a, sa]), 0.0
+        da = float(d[pa, b] + d[b, sa] - d[pa, a] - d[a, sa])
+        db = float(d[pb, a] + d[a, sb] - d[pb, b] - d[b, sb])
+        if self.route_of[a] == self.route_of[b]:
+            return da + db, 0.0
+        return da, db
+
+    def swap_delta(self, a: int, b: int) -> float | None:
+        """Cost change of exchanging points ``a`` and ``b``, or ``None`` if it breaks capacity."""
+        if a == b:
+            return 0.0
+        ra, rb = self.route_of[a], self.route_of[b]
+        if ra != rb:
+            shift = self.demand[b] - self.demand[a]
+            if self.loads[ra] + shift > self.capacity or self.loads[rb] - shift > self.capacity:
+                return None
+        da, db = self._swap_deltas(a, b)
+        return da + db
+
+    def apply_swap(self, a: int, b: int) -> None:
+        if a == b:
+            return
+        ra, rb = self.route_of[a], self.route_of[b]
+        ia, ib = self.pos_of[a], self.pos_of[b]
+        da, db = self._swap_deltas(a, b)
+        self.routes[ra][ia], self.routes[rb][ib] = b, a
+        self.route_of[a], self.route_of[b] = rb, ra
+        self.pos_of[a], self.pos_of[b] = ib, ia
+        if ra != rb:
+            shift = self.demand[b] - self.demand[a]
+            self.loads[ra] += shift
+            self.loads[rb] -= shift
+            self.costs[rb] += db
+        self.costs[ra] += da
+        self.total += da + db
+        self._touch(ra, rb)
+
+    def _touch(self, *ks: int) -> None:
+        for k in ks:
+            self.version[k] += 1
+            self._prefix.pop(k, None)
+
+    def prefix_load(self, k: int, i: int) -> int:
+        """Load of route ``k`` up to and including position ``i`` (``-1`` gives 0)."""
+        pre = self._prefix.get(k)
+        if pre is None:
+            pre = [0]
+            for p in self.routes[k]:
+                pre.append(pre[-1] + self.demand[p])
+            self._prefix[k] = pre
+        return pre[i + 1]
+
+    def set_route(self, k: int, points: list[int]) -> None:
+        """Replace route ``k`` wholesale, re-deriving its positions, load and cost."""
+        self.routes[k] = list(points)
+        for i, p in enumerate(points):
+            self.route_of[p] = k
+            self.pos_of[p] = i
+        self.loads[k] = sum(self.demand[p] for p in points)
+        cost = self.cache(points)
+        self.total += cost - self.costs[k]
+        self.costs[k] = cost
+        self._touch(k)
+
+    def recompute(self) -> float:
+        """Re-price every route from scratch, discarding accumulated floating-point drift."""
+        self.costs = [self.cache(r) for r in self.routes]
+        self.total = float(sum(self.costs))
+        return self.total
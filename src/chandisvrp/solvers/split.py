@@ -1,9 +1,151 @@
 from __future__ import annotations
 
+from collections import deque
+from typing import Sequence
+
+import numpy as np
+
+from chandisvrp.instances.compiled import CompiledInstance
 from chandisvrp.types import Customer
 
 
-def split_by_capacity(permutation: list[int], customers: list[Customer], capacity: int) -> list[list[int]]:
+def split_points(points: Sequence[int], demand: np.ndarray, capacity: int) -> list[list[int]]:
+    routes: list[list[int]] = []
+    cur: list[int] = []
+    load = 0
+    for p, dem in zip(points, demand[np.asarray(points, dtype=np.int64)].tolist()):
+        if cur and load + dem > capacity:
+            routes.append(cur)
+            cur = []
+            load = 0
+        cur.append(p)
+        load += dem
+    if cur:
+        routes.append(cur)
+    return routes
+
+
+def _split_arrays(points: np.ndarray, dist, demand: np.ndarray, capacity: int):
+    # 1-based positions along the giant tour; route i..j costs out[i] + arc[j] - arc[i] + back[j].
+    n = points.size
+    out = np.zeros(n + 1)
+    back = np.zeros(n + 1)
+    arc = np.zeros(n + 1)
+    out[1:] = np.asarray(dist[0, points], dtype=float)
+    back[1:] = np.asarray(dist[points, 0], dtype=float)
+    if n > 1:
+        arc[2:] = np.cumsum(np.asarray(dist[points[:-1], points[1:]], dtype=float))
+    load = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(demand[points], out=load[1:])
+    # First feasible route start for each end j; a lone over-capacity customer still gets a route.
+    lo = np.searchsorted(load, load[1:] - capacity, side="left") + 1
+    lo = np.minimum(lo, np.arange(1, n + 1))
+    return out, back, arc, np.concatenate([[0], lo])
+
+
+def _cuts_to_routes(points: np.ndarray, pred: list[int], n: int) -> list[list[int]]:
+    routes: list[list[int]] = []
+    j = n
+    while j > 0:
+        i = pred[j]
+        routes.append(points[i - 1 : j].tolist())
+        j = i - 1
+    return routes[::-1]
+
+
+def _split_unlimited(points: np.ndarray, out, back, arc, lo) -> tuple[list[list[int]], float]:
+    # Sliding-window minimum over route starts (monotone deque): O(n) for the whole tour.
+    n = points.size
+    out_l, back_l, arc_l, lo_l = out.tolist(), back.tolist(), arc.tolist(), lo.tolist()
+    v = [0.0] * (n + 1)
+    pred = [0] * (n + 1)
+    key = [0.0] * (n + 1)
+    window: deque[int] = deque()
+    for j in range(1, n + 1):
+        key[j] = v[j - 1] + out_l[j] - arc_l[j]
+        while window and key[window[-1]] >= key[j]:
+            window.pop()
+        window.append(j)
+        while window[0] < lo_l[j]:
+            window.popleft()
+        i = window[0]
+        v[j] = key[i] + arc_l[j] + back_l[j]
+        pred[j] = i
+    return _cuts_to_routes(points, pred, n), v[n]
+
+
+def _range_min(values: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Sparse table over ``values``: min and argmin of every [lo, hi] window, all queries at once.
+    arg = [np.arange(values.size)]
+    width = 1
+    while 2 * width <= values.size:
+        a, b = arg[-1][:-width], arg[-1][width:]
+        arg.append(np.where(values[b] < values[a], b, a))
+        width *= 2
+    level = np.floor(np.log2(hi - lo + 1)).astype(np.int64)
+    first = np.empty(lo.size, dtype=np.int64)
+    second = np.empty(lo.size, dtype=np.int64)
+    for k in np.unique(level).tolist():
+        sel = level == k
+        first[sel] = arg[k][lo[sel]]
+        second[sel] = arg[k][hi[sel] - (1 << k) + 1]
+    best = np.where(values[second] < values[first], second, first)
+    return values[best], best
+
+
+def _split_fleet(points: np.ndarray, out, back, arc, lo, n_vehicles: int) -> tuple[list[list[int]], float] | None:
+    # Layer k holds the best cost of covering the first j customers with exactly k routes; each
+    # layer only depends on the previous one, so it is a batch of window minima.
+    n = points.size
+    ends = np.arange(1, n + 1)
+    prev = np.full(n + 1, np.inf)
+    prev[0] = 0.0
+    preds: list[np.ndarray] = []
+    best_k, best_cost = 0, np.inf
+    for k in range(1, min(n_vehicles, n) + 1):
+        key = prev[:-1] + out[1:] - arc[1:]
+        m, arg = _range_min(key, lo[1:] - 1, ends - 1)
+        cur = np.full(n + 1, np.inf)
+        cur[1:] = m + arc[1:] + back[1:]
+        preds.append(arg + 1)
+        if cur[n] < best_cost:
+            best_k, best_cost = k, float(cur[n])
+        if not np.isfinite(cur).any():
+            break
+        prev = cur
+    if not best_k:
+        return None
+    routes: list[list[int]] = []
+    j = n
+    for k in range(best_k, 0, -1):
+        i = int(preds[k - 1][j - 1])
+        routes.append(points[i - 1 : j].tolist())
+        j = i - 1
+    return routes[::-1], best_cost
+
+
+def optimal_split(
+    points: Sequence[int], dist, demand: np.ndarray, capacity: int, n_vehicles: int | None = None
+) -> tuple[list[list[int]], float]:
+    """Prins' Split: cheapest way to cut a giant tour of points into capacity-feasible depot routes.
+
+    With ``n_vehicles`` the number of routes is bounded as well; if the tour cannot be cut into
+    that many routes the unbounded split is returned instead.
+    """
+    pts = np.asarray(points, dtype=np.int64)
+    if pts.size == 0:
+        return [], 0.0
+    arrays = _split_arrays(pts, dist, demand, capacity)
+    if n_vehicles is not None:
+        limited = _split_fleet(pts, *arrays, int(n_vehicles))
+        if limited is not None:
+            return limited
+    return _split_unlimited(pts, *arrays)
+
+
+def split_by_capacity(permutation: list[int], customers: list[Customer] | CompiledInstance, capacity: int) -> list[list[int]]:
+    if isinstance(customers, CompiledInstance):
+        return customers.to_id_routes(split_points(customers.points(permutation), customers.demand, capacity))
     cmap = {c.customer_id: c for c in customers}
     routes: list[list[int]] = []
     cur: list[int] = []
@@ -3,50 +3,42 @@ from __future__ import annotations
 import networkx as nx
 import numpy as np
 
+from chandisvrp.instances.compiled import CompiledInstance, ensure_compiled
 from chandisvrp.stochastic.travel_time import travel_time_s
 from chandisvrp.types import Instance, RoutePlan, SimulationOutcome
 
 
-def _edge_stats(g: nx.MultiDiGraph, u: int, v: int) -> tuple[float, float]:
-    if g.has_edge(u, v):
-        data = next(iter(g.get_edge_data(u, v).values()))
-        return float(data.get("length_m", data.get("length", 500.0))), float(data.get("base_time_s", 60.0))
-    return 500.0, 60.0
-
-
 def simulate_plan(
     g: nx.MultiDiGraph,
     instance: Instance,
     plan: RoutePlan,
     stochastic_cfg: dict,
     rng: np.random.Generator,
+    compiled: CompiledInstance | None = None,
 ) -> SimulationOutcome:
-    c_map = {c.customer_id: c for c in instance.customers}
+    ci = ensure_compiled(g, instance, compiled)
+    length, base_time = ci.length_m, ci.time_s
+    tw_start, tw_end, service = ci.tw_start_s.tolist(), ci.tw_end_s.tolist(), ci.service_s.tolist()
     total_time = 0.0
     total_dist = 0.0
     late = 0
     lateness: list[float] = []
     start_s = stochastic_cfg.get("start_hour", 8.0) * 3600.0
-    for route in plan.routes:
+    for route in ci.to_point_routes(plan.routes):
+        stops = [0, *route, 0]
+        legs_d = np.asarray(length[stops[:-1], stops[1:]], dtype=float).tolist()
+        legs_t = np.asarray(base_time[stops[:-1], stops[1:]], dtype=float).tolist()
         t = start_s
-        prev = instance.depot_node
-        for cid in route:
-            c = c_map[cid]
-            d, bt = _edge_stats(g, prev, c.node)
-            tr_t = travel_time_s(rng, bt, d, t, stochastic_cfg)
-            t += tr_t
-            total_dist += d
-            if t < c.tw_start_s:
-                t = c.tw_start_s
-            if t > c.tw_end_s:
+        for k, p in enumerate(route):
+            t += travel_time_s(rng, legs_t[k], legs_d[k], t, stochastic_cfg)
+            if t < tw_start[p]:
+                t = tw_start[p]
+            if t > tw_end[p]:
                 late += 1
-                lateness.append(t - c.tw_end_s)
-            t += c.service_time_s
-            prev = c.node
-        d, bt = _edge_stats(g, prev, instance.depot_node)
-        tr_t = travel_time_s(rng, bt, d, t, stochastic_cfg)
-        t += tr_t
-        total_dist += d
+                lateness.append(t - tw_end[p])
+            t += service[p]
+        t += travel_time_s(rng, legs_t[-1], legs_d[-1], t, stochastic_cfg)
+        total_dist += sum(legs_d)
         total_time += t - start_s
     feasible = late == 0
     return SimulationOutcome(
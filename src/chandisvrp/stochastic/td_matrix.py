@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Any
+
+import numpy as np
+
+from chandisvrp.geo.matrix import DistanceMatrix
+from chandisvrp.instances.compiled import CompiledInstance
+from chandisvrp.stochastic.traffic_model import peak_intensity
+from chandisvrp.types import RoutePlan, SimulationOutcome
+
+DAY_S = 24 * 3600.0
+
+
+class TimeDependentMatrix:
+    """Deterministic time-of-day travel times on top of a DistanceMatrix.
+
+    ``congestion_delay_s`` factors into ``base * strength * intensity(hour) * (1 - exp(-d / lambda))``,
+    so one congestion factor per slice plus the base matrices give every slice's travel time.
+    Factors are linearly interpolated between slice starts and wrap at midnight. Whole-slice
+    matrices cover only ``rows`` (normally ``CompiledInstance.rows``) and are built once per slice.
+    """
+
+    def __init__(
+        self, matrix: DistanceMatrix, cfg: dict[str, Any], slice_min: float = 15.0, rows: np.ndarray | None = None
+    ):
+        self.matrix = matrix
+        self.rows = np.arange(len(matrix.nodes)) if rows is None else np.asarray(rows, dtype=np.int64)
+        self.slice_s = float(slice_min) * 60.0
+        n_slices = max(1, int(round(DAY_S / self.slice_s)))
+        hours = np.arange(n_slices) * self.slice_s / 3600.0
+        intensity = np.array([peak_intensity(h, cfg["peak_hours"], float(cfg["peak_sigma_h"])) for h in hours])
+        self.factor = float(cfg["congestion_strength"]) * intensity
+        self.lambda_m = float(cfg["distance_lambda_m"])
+        self._slices: dict[int, np.ndarray] = {}
+
+    @property
+    def n_slices(self) -> int:
+        return int(self.factor.size)
+
+    def slice_factor(self, depart_s: float | np.ndarray) -> float | np.ndarray:
+        pos = (np.asarray(depart_s, dtype=float) % DAY_S) / self.slice_s
+        lo = np.floor(pos).astype(np.int64)
+        w = pos - lo
+        lo %= self.n_slices
+        return (1.0 - w) * self.factor[lo] + w * self.factor[(lo + 1) % self.n_slices]
+
+    def travel_time(self, i: int | np.ndarray, j: int | np.ndarray, depart_s: float | np.ndarray) -> float | np.ndarray:
+        base = np.asarray(self.matrix.time_s[i, j], dtype=float)
+        dist = np.asarray(self.matrix.length_m[i, j], dtype=float)
+        return base * (1.0 + (1.0 - np.exp(-dist / self.lambda_m)) * self.slice_factor(depart_s))
+
+    @cached_property
+    def _row_base(self) -> tuple[np.ndarray, np.ndarray]:
+        ix = np.ix_(self.rows, self.rows)
+        base = np.asarray(self.matrix.time_s[ix], dtype=float)
+        dist = np.asarray(self.matrix.length_m[ix], dtype=float)
+        return base, 1.0 - np.exp(-dist / self.lambda_m)
+
+    def slice_matrix(self, k: int) -> np.ndarray:
+        k %= self.n_slices
+        if k not in self._slices:
+            base, reach = self._row_base
+            self._slices[k] = base * (1.0 + reach * self.factor[k])
+        return self._slices[k]
+
+
+def evaluate_plan(compiled: CompiledInstance, plan: RoutePlan, td: TimeDependentMatrix, start_s: float) -> SimulationOutcome:
+    """Noise-free counterpart of ``simulate_plan``: same cost model, time-dependent mean travel times.
+
+    Like the simulator, every leg takes at least one second.
+    """
+    ci = compiled
+    rows = ci.rows
+    tw_start, tw_end, service = ci.tw_start_s.tolist(), ci.tw_end_s.tolist(), ci.service_s.tolist()
+    total_time = 0.0
+    total_dist = 0.0
+    lateness: list[float] = []
+    for route in ci.to_point_routes(plan.routes):
+        stops = rows[[0, *route, 0]]
+        total_dist += float(np.asarray(td.matrix.length_m[stops[:-1], stops[1:]], dtype=float).sum())
+        t = start_s
+        for k, p in enumerate(route):
+            t += max(1.0, float(td.travel_time(stops[k], stops[k + 1], t)))
+            t = max(t, tw_start[p])
+            if t > tw_end[p]:
+                lateness.append(t - tw_end[p])
+            t += service[p]
+        t += max(1.0, float(td.travel_time(stops[-2], stops[-1], t)))
+        total_time += t - start_s
+    return SimulationOutcome(
+        total_time_s=total_time,
+        total_cost=total_dist + 0.1 * total_time,
+        total_distance_m=total_dist,
+        feasible=not lateness,
+        late_stops=len(lateness),
+        lateness_values_s=lateness,
+    )
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Iterable
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class Customer:
     customer_id: int
     node: int
@@ -15,7 +17,7 @@ class Customer:
     kind: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Instance:
     schema_version: str
     instance_id: str
@@ -26,7 +28,7 @@ class Instance:
     vehicle_capacity: int
 
 
-@dataclass
+@dataclass(slots=True)
 class RoutePlan:
     routes: list[list[int]]
     planned_cost: float = 0.0
@@ -34,12 +36,84 @@ class RoutePlan:
     planned_time_s: float = 0.0
     meta: dict[str, Any] = field(default_factory=dict)
 
+    def to_flat(self) -> FlatRoutePlan:
+        return FlatRoutePlan.from_plan(self)
+
+
+@dataclass(slots=True)
+class FlatRoutePlan:
+    """RoutePlan stored as one int32 customer array; route ``k`` is ``customers[offsets[k]:offsets[k + 1]]``."""
+
+    customers: np.ndarray
+    offsets: np.ndarray
+    planned_cost: float = 0.0
+    planned_distance_m: float = 0.0
+    planned_time_s: float = 0.0
+    meta: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_routes(cls, routes: Iterable[Iterable[int]], **kwargs: Any) -> FlatRoutePlan:
+        routes = [list(r) for r in routes]
+        offsets = np.zeros(len(routes) + 1, dtype=np.int64)
+        np.cumsum([len(r) for r in routes], out=offsets[1:])
+        customers = np.fromiter((c for r in routes for c in r), dtype=np.int32, count=int(offsets[-1]))
+        return cls(customers, offsets, **kwargs)
 
-@dataclass
+    @classmethod
+    def from_plan(cls, plan: RoutePlan) -> FlatRoutePlan:
+        return cls.from_routes(
+            plan.routes,
+            planned_cost=plan.planned_cost,
+            planned_distance_m=plan.planned_distance_m,
+            planned_time_s=plan.planned_time_s,
+            meta=dict(plan.meta),
+        )
+
+    @property
+    def n_routes(self) -> int:
+        return int(self.offsets.size) - 1
+
+    def route(self, k: int) -> np.ndarray:
+        return self.customers[self.offsets[k] : self.offsets[k + 1]]
+
+    @property
+    def routes(self) -> list[list[int]]:
+        if self.n_routes == 0:
+            return []
+        return [r.tolist() for r in np.split(self.customers, self.offsets[1:-1])]
+
+    def to_plan(self) -> RoutePlan:
+        return RoutePlan(
+            routes=self.routes,
+            planned_cost=self.planned_cost,
+            planned_distance_m=self.planned_distance_m,
+            planned_time_s=self.planned_time_s,
+            meta=dict(self.meta),
+        )
+
+
+@dataclass(slots=True)
 class SimulationOutcome:
     total_time_s: float
     total_cost: float
     total_distance_m: float
     feasible: bool
     late_stops: int
-    lateness_values_s: list[float]
+    lateness_values_s: np.ndarray
+
+    def __post_init__(self) -> None:
+        # Lists from older callers are accepted and stored compactly.
+        self.lateness_values_s = np.asarray(self.lateness_values_s, dtype=np.float64)
+
+    def __eq__(self, other: object) -> bool:
+        # The generated __eq__ would compare the lateness arrays elementwise and fail on truthiness.
+        if not isinstance(other, SimulationOutcome):
+            return NotImplemented
+        return (
+            self.total_time_s == other.total_time_s
+            and self.total_cost == other.total_cost
+            and self.total_distance_m == other.total_distance_m
+            and self.feasible == other.feasible
+            and self.late_stops == other.late_stops
+            and np.array_equal(self.lateness_values_s, other.lateness_values_s)
+        )
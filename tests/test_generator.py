@@ -0,0 +1,17 @@
+import numpy as np
+
+from chandisvrp.config import load_config
+from chandisvrp.geo.osm_graph import build_synthetic_graph
+from chandisvrp.instances.generator import build_instances
+
+
+def test_instances_independent_of_worker_count() -> None:
+    g = build_synthetic_graph(6, 6, 100)
+    cfg = load_config("configs/default.yaml")
+    cfg["instance"].update({"n_instances": 3, "n_customers": [5, 10], "central_warehouse": {}})
+    serial = build_instances(g, cfg, "Chandigarh", np.random.default_rng(7))
+    cfg["instance"]["workers"] = 2
+    parallel = build_instances(g, cfg, "Chandigarh", np.random.default_rng(7))
+    assert serial == parallel
+    assert [len(i.customers) for i in serial] == [5, 10, 5]
+    assert all(c.node != serial[0].depot_node for c in serial[0].customers)
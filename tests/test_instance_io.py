@@ -1,5 +1,8 @@
 from pathlib import Path
 
+import numpy as np
+
+from chandisvrp.instances.bundle import InstanceBundle, save_bundle
 from chandisvrp.instances.serialization import load_instance, save_instance
 from chandisvrp.types import Customer, Instance
 
@@ -19,3 +22,22 @@ def test_instance_save_load(tmp_path: Path) -> None:
     loaded = load_instance(p)
     assert loaded.instance_id == "abc"
     assert loaded.customers[0].demand == 3
+
+
+def test_bundle_roundtrip_and_random_access(tmp_path: Path) -> None:
+    insts = [
+        Instance("1.0", f"i{k}", "Chandigarh", 0, [Customer(c, 10 + c, c, 60.0, 0.0, 1000.0, "commercial" if c % 2 else "residential") for c in range(1, k + 2)], 2, 20)
+        for k in range(3)
+    ]
+    # Another writer's scratch file is neither reused nor left next to ours.
+    (tmp_path / "all.bundle.tmp").write_bytes(b"other writer")
+    p = save_bundle(insts, tmp_path / "all.bundle")
+    assert sorted(f.name for f in tmp_path.iterdir()) == ["all.bundle", "all.bundle.tmp"]
+    assert (tmp_path / "all.bundle.tmp").read_bytes() == b"other writer"
+    bundle = InstanceBundle(p)
+    assert bundle.ids == ["i0", "i1", "i2"]
+    assert bundle["i2"] == insts[2]
+    cols = bundle.arrays("i1")
+    assert isinstance(cols["demand"].base, np.memmap) or isinstance(cols["demand"], np.memmap)
+    assert cols["node"].tolist() == [11, 12]
+    assert [p.name for p in bundle.export_json(tmp_path / "json")] == ["i0.json", "i1.json", "i2.json"]
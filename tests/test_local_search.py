@@ -0,0 +1,21 @@
+import numpy as np
+
+from chandisvrp.solvers.local_search import local_search
+from chandisvrp.solvers.route_opt import neighbor_lists
+from chandisvrp.solvers.route_state import RouteState
+from chandisvrp.solvers.split import split_points
+
+
+def test_local_search_keeps_state_consistent_and_feasible() -> None:
+    rng = np.random.default_rng(2)
+    n = 25
+    dist = rng.uniform(1, 50, size=(n + 1, n + 1))
+    demand = np.array([0] + rng.integers(1, 5, size=n).tolist())
+    routes = split_points(rng.permutation(np.arange(1, n + 1)).tolist(), demand, 12)
+    state = RouteState(routes, dist, demand, 12)
+    before = state.total
+    local_search(state, neighbor_lists(dist, 5))
+    assert sorted(p for r in state.routes for p in r) == list(range(1, n + 1))
+    assert all(load <= 12 for load in state.loads)
+    assert state.total < before
+    assert np.isclose(state.total, state.recompute())
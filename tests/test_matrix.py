@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import numpy as np
+
+from chandisvrp.geo.compiled import compile_graph
+from chandisvrp.geo.matrix import build_distance_matrix, load_or_build_matrix
+from chandisvrp.geo.osm_graph import build_synthetic_graph
+
+
+def test_matrix_uses_network_shortest_paths() -> None:
+    g = build_synthetic_graph(4, 4, 200)
+    m = build_distance_matrix(g, [0, 5, 15, 5])
+    assert list(m.nodes) == [0, 5, 15]
+    assert np.allclose(np.diag(m.length_m), 0.0)
+    assert m.length_m[m.index[0], m.index[15]] == 6 * 200
+    assert m.length_m[m.index[0], m.index[5]] == 2 * 200
+    assert m.time_s[m.index[0], m.index[15]] > m.time_s[m.index[0], m.index[5]]
+
+
+def test_compiled_graph_matches_networkx() -> None:
+    g = build_synthetic_graph(3, 3, 100)
+    cg = compile_graph(g)
+    assert cg.n_nodes == g.number_of_nodes()
+    assert cg.n_edges == g.number_of_edges()
+    i = int(cg.index_of([4])[0])
+    assert sorted(cg.node_ids[cg.neighbors(i)].tolist()) == sorted(g.successors(4))
+    assert cg.coords(4) == (g.nodes[4]["x"], g.nodes[4]["y"])
+
+
+def test_matrix_cache_roundtrip(tmp_path: Path) -> None:
+    cg = compile_graph(build_synthetic_graph(4, 4, 200))
+    built = load_or_build_matrix(cg, [0, 5, 15], tmp_path)
+    assert len(list(tmp_path.iterdir())) == 1
+    cached = load_or_build_matrix(cg, [15, 0, 5], tmp_path)
+    assert isinstance(cached.length_m, np.memmap)
+    assert cached.length_m[cached.index[15], cached.index[0]] == built.length_m[built.index[15], built.index[0]]
+
+
+def test_tiled_matrix_matches_dense(tmp_path: Path) -> None:
+    cg = compile_graph(build_synthetic_graph(5, 5, 150))
+    nodes = [12, 0, 3, 7, 24, 18]
+    dense = build_distance_matrix(cg, nodes)
+    tiled = load_or_build_matrix(cg, nodes, tmp_path, {"tiled_min_nodes": 4, "tile_rows": 4, "hot_rows": 2})
+    rows = dense.rows(nodes)
+    assert np.allclose(tiled.length_m[np.ix_(rows, rows)], dense.length_m[np.ix_(rows, rows)])
+    assert np.allclose(tiled.time_s[rows[:-1], rows[1:]], dense.time_s[rows[:-1], rows[1:]])
+    assert tiled.length_m[1, 4] == dense.length_m[1, 4]
+
+
+def test_tiled_cache_serves_any_order_of_the_same_nodes(tmp_path: Path) -> None:
+    cg = compile_graph(build_synthetic_graph(5, 5, 150))
+    cfg = {"tiled_min_nodes": 2, "tile_rows": 2}
+    first = load_or_build_matrix(cg, [0, 24, 12], tmp_path, cfg)
+    second = load_or_build_matrix(cg, [12, 0, 24], tmp_path, cfg)
+    dense = build_distance_matrix(cg, [12, 0, 24])
+    for a, b in [(12, 0), (0, 24), (24, 12)]:
+        want = dense.length_m[dense.index[a], dense.index[b]]
+        assert first.length_m[first.index[a], first.index[b]] == want
+        assert second.length_m[second.index[a], second.index[b]] == want
+
+
+def test_tiled_unreachable_penalty_matches_dense(tmp_path: Path) -> None:
+    g = build_synthetic_graph(5, 5, 150)
+    g.add_node(99, x=10_000.0, y=10_000.0)
+    cg = compile_graph(g)
+    nodes = [0, 99, 24, 3, 12]
+    dense = build_distance_matrix(cg, nodes)
+    tiled = load_or_build_matrix(cg, nodes, tmp_path, {"tiled_min_nodes": 2, "tile_rows": 2})
+    assert np.allclose(tiled.length_m[:, :], dense.length_m)
+    assert np.allclose(tiled.time_s[:, :], dense.time_s)
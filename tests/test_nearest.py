@@ -0,0 +1,47 @@
+import math
+
+import networkx as nx
+import numpy as np
+
+from chandisvrp.geo.compiled import compile_graph
+from chandisvrp.geo.nearest import NodeIndex, nearest_node, nearest_nodes
+from chandisvrp.geo.osm_graph import build_synthetic_graph
+
+
+def _haversine_m(lon1: float, lat1: float, lon2: np.ndarray, lat2: np.ndarray) -> np.ndarray:
+    p1, p2 = math.radians(lat1), np.radians(lat2)
+    a = np.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * np.cos(p2) * np.sin(np.radians(lon2 - lon1) / 2) ** 2
+    return 2 * 6_371_000.0 * np.arcsin(np.sqrt(a))
+
+
+def test_nearest_nodes_match_brute_force_in_meters() -> None:
+    g = build_synthetic_graph(6, 6, 150)
+    rng = np.random.default_rng(0)
+    xs, ys = rng.uniform(-50, 800, 40), rng.uniform(-50, 800, 40)
+    ids = np.array(list(g.nodes()))
+    pts = np.array([(g.nodes[n]["x"], g.nodes[n]["y"]) for n in ids])
+    want = [ids[np.argmin(np.hypot(pts[:, 0] - x, pts[:, 1] - y))] for x, y in zip(xs, ys)]
+    assert nearest_nodes(g, xs, ys).tolist() == want
+    assert nearest_nodes(compile_graph(g), xs, ys).tolist() == want
+    assert NodeIndex.from_graph(g) is NodeIndex.from_graph(g)
+
+
+def test_nearest_nodes_match_haversine_in_lonlat() -> None:
+    rng = np.random.default_rng(1)
+    g = nx.MultiDiGraph()
+    lon, lat = rng.uniform(76.70, 76.85, 300), rng.uniform(30.68, 30.78, 300)
+    for i, (x, y) in enumerate(zip(lon, lat)):
+        g.add_node(i, x=float(x), y=float(y))
+    for qx, qy in zip(rng.uniform(76.71, 76.84, 30), rng.uniform(30.69, 30.77, 30)):
+        assert nearest_node(g, qx, qy) == int(np.argmin(_haversine_m(qx, qy, lon, lat)))
+    assert NodeIndex.from_graph(g).geographic
+
+
+def test_graph_index_is_rebuilt_after_nodes_move_or_change() -> None:
+    g = build_synthetic_graph(3, 3, 100)
+    assert nearest_node(g, 2.0, 2.0) == 0
+    g.nodes[4]["x"], g.nodes[4]["y"] = 1.0, 1.0
+    assert nearest_node(g, 2.0, 2.0) == 4
+    g.remove_node(4)
+    g.add_node(99, x=3.0, y=3.0)
+    assert nearest_node(g, 2.0, 2.0) == 99
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import numpy as np
+import osmnx as ox
+import pytest
+
+import chandisvrp.geo.osm_graph as osm_graph
+from chandisvrp.geo.compiled import compile_graph
+from chandisvrp.geo.osm_graph import (
+    build_synthetic_graph,
+    load_compiled_graph,
+    snapshot_path,
+)
+from chandisvrp.geo.synthetic import generate_road_network
+
+
+def test_graph_snapshot_written_and_invalidated(tmp_path: Path) -> None:
+    src = tmp_path / "city.graphml"
+    g = build_synthetic_graph(3, 3, 100)
+    g.graph["crs"] = "epsg:4326"
+    ox.save_graphml(g, src)
+
+    cold, _ = load_compiled_graph("x", src, use_osm=False)
+    assert snapshot_path(src).exists()
+    warm, cg = load_compiled_graph("x", src, use_osm=False)
+    assert warm.number_of_edges() == cold.number_of_edges()
+    assert cg.digest == compile_graph(cold).digest
+
+    g.remove_node(8)
+    ox.save_graphml(g, src)
+    fresh, _ = load_compiled_graph("x", src, use_osm=False)
+    assert fresh.number_of_nodes() == 8
+
+
+def test_vectorized_generator_matches_grid_and_adds_variety() -> None:
+    assert generate_road_network(5, 5, 250).digest == compile_graph(build_synthetic_graph(5, 5, 250)).digest
+    cg = generate_road_network(30, 30, 100, np.random.default_rng(3), arterial_every=5, drop_prob=0.2, one_way_prob=0.3)
+    plain = generate_road_network(30, 30, 100)
+    assert cg.n_edges < plain.n_edges
+    assert len(np.unique(np.round(cg.base_time_s, 6))) == 2
+
+
+def test_snapshot_write_failure_keeps_loaded_graph(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    src = tmp_path / "city.graphml"
+    g = build_synthetic_graph(3, 3, 100)
+    g.graph["crs"] = "epsg:4326"
+    ox.save_graphml(g, src)
+
+    def fail(*args, **kwargs):
+        raise OSError("read-only file system")
+
+    monkeypatch.setattr(osm_graph, "save_graph_snapshot", fail)
+    loaded, _ = load_compiled_graph("x", src, use_osm=False, synthetic_cfg={"grid_w": 2, "grid_h": 2})
+    assert loaded.number_of_nodes() == 9
+    assert not snapshot_path(src).exists()
@@ -0,0 +1,27 @@
+import numpy as np
+
+from chandisvrp.solvers.constructive import route_length
+from chandisvrp.solvers.route_opt import neighbor_lists, optimize_route
+
+
+def test_optimize_route_reaches_two_opt_optimum_on_asymmetric_matrix() -> None:
+    rng = np.random.default_rng(5)
+    dist = rng.uniform(1, 50, size=(11, 11))
+    route = rng.permutation(np.arange(1, 11)).tolist()
+    best = optimize_route(route, dist)
+    assert sorted(best) == sorted(route)
+    tour = [0, *best, 0]
+    cost = route_length(best, dist)
+    for i in range(1, len(tour) - 1):
+        for j in range(i + 1, len(tour) - 1):
+            cand = tour[:i] + tour[i : j + 1][::-1] + tour[j + 1 :]
+            assert route_length(cand[1:-1], dist) >= cost - 1e-9
+
+
+def test_neighbor_lists_are_sorted_nearest() -> None:
+    rng = np.random.default_rng(0)
+    dist = rng.uniform(1, 50, size=(8, 8))
+    nb = neighbor_lists(dist, 3, block=3)
+    for p in range(1, 8):
+        others = [q for q in range(1, 8) if q != p]
+        assert nb[p] == sorted(others, key=lambda q: dist[p, q])[:3]
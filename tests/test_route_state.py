@@ -0,0 +1,32 @@
+import numpy as np
+
+from chandisvrp.solvers.constructive import route_length
+from chandisvrp.solvers.route_cache import RouteCostCache
+from chandisvrp.solvers.route_state import RouteState
+
+
+def test_swap_delta_matches_full_recompute() -> None:
+    rng = np.random.default_rng(3)
+    dist = rng.uniform(1, 100, size=(9, 9))
+    demand = np.array([0, 2, 3, 1, 4, 2, 2, 3, 1])
+    state = RouteState([[1, 2, 3, 4], [5, 6, 7, 8]], dist, demand, capacity=12)
+    for a, b in rng.integers(1, 9, size=(200, 2)).tolist():
+        delta = state.swap_delta(a, b)
+        if delta is None:
+            continue
+        before = state.total
+        state.apply_swap(a, b)
+        assert np.isclose(state.total, before + delta)
+        assert np.isclose(state.total, state.recompute())
+        assert all(load <= 12 for load in state.loads)
+
+
+def test_route_cost_cache_counts_and_evicts_lru() -> None:
+    dist = np.arange(25, dtype=float).reshape(5, 5)
+    cache = RouteCostCache(dist, maxsize=2)
+    assert cache([1, 2]) == route_length([1, 2], dist)
+    cache([3])
+    cache([1, 2])
+    cache([4])  # evicts [3], the least recently used
+    cache([3])
+    assert cache.stats() == {"hits": 1, "misses": 4, "size": 2}
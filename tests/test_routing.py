@@ -0,0 +1,21 @@
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+from chandisvrp.geo.compiled import compile_graph
+from chandisvrp.geo.osm_graph import build_synthetic_graph
+from chandisvrp.geo.routing import RouteQueryEngine
+
+
+def test_alt_queries_match_dijkstra() -> None:
+    g = build_synthetic_graph(6, 6, 100)
+    g.remove_edge(7, 8)
+    g.remove_edge(14, 20)
+    cg = compile_graph(g)
+    engine = RouteQueryEngine(cg, n_landmarks=4)
+    ref = dijkstra(cg.csgraph(), indices=[0, 13])
+    for s_row, s in enumerate([0, 13]):
+        for t in range(cg.n_nodes):
+            d, path = engine.query(int(cg.node_ids[s]), int(cg.node_ids[t]))
+            assert np.isclose(d, ref[s_row, t])
+            assert path[0] == cg.node_ids[s] and path[-1] == cg.node_ids[t]
+            assert len(path) - 1 == round(d / 100)
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from chandisvrp.config import load_config
+from chandisvrp.evaluation.runner import BenchmarkRunner
+from chandisvrp.geo.osm_graph import build_synthetic_graph
+from chandisvrp.reporting.plots import _anytime_gaps, make_plots
+from chandisvrp.types import Customer, Instance
+
+
+def test_runner_saves_traces_and_plots_anytime_curves(tmp_path: Path) -> None:
+    cfg = load_config("configs/default.yaml")
+    cfg["data"].update(
+        results_csv=str(tmp_path / "results.csv"),
+        summary_csv=str(tmp_path / "summary.csv"),
+        metadata_json=str(tmp_path / "meta.json"),
+        traces_csv=str(tmp_path / "traces.csv"),
+        matrix_cache_dir=None,
+    )
+    cfg["evaluation"].update(solvers=["nn2opt", "alns"], run_seeds=[1], mc_rollouts=2, time_limit_s=0.2)
+    customers = [Customer(100 + i, i, 1 + i % 3, 60, 0, 10**6, "residential") for i in range(1, 13)]
+    inst = Instance("1.0", "t", "Chandigarh", 0, customers, 3, 8)
+    runner = BenchmarkRunner(build_synthetic_graph(4, 4, 200), cfg)
+    df, summary = runner.run([inst])
+    runner.save(df, summary)
+
+    traces = pd.read_csv(tmp_path / "traces.csv")
+    assert set(traces["solver"]) == {"nn2opt", "alns"}
+    # The last point of each trace is the plan the runner scored.
+    last = traces.groupby("solver")["cost"].last()
+    planned = df.set_index("solver")["planned_distance_m"]
+    assert (last - planned).abs().max() < 1e-6
+    artifacts = make_plots(df, summary, tmp_path / "figures", traces)
+    assert artifacts["anytime_performance"].exists()
+
+
+def test_anytime_gaps_skip_instances_with_zero_best_cost() -> None:
+    traces = pd.DataFrame(
+        {
+            "instance_id": ["a", "a", "z", "z"],
+            "solver": ["alns"] * 4,
+            "run_seed": [1] * 4,
+            "elapsed_s": [0.0, 0.1, 0.0, 0.1],
+            "cost": [120.0, 100.0, 0.0, 0.0],
+        }
+    )
+    gaps = _anytime_gaps(traces)
+    assert set(gaps["instance_id"]) == {"a"}
+    assert np.isfinite(gaps["gap_pct"]).all()
+    assert gaps["gap_pct"].tolist() == pytest.approx([20.0, 0.0])
@@ -0,0 +1,191 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from chandisvrp.geo.osm_graph import build_synthetic_graph
+from chandisvrp.instances.compiled import ensure_compiled
+from chandisvrp.solvers.aco_solver import ACOSolver
+from chandisvrp.solvers.alns_solver import ALNSSolver
+from chandisvrp.solvers.constructive import plan_length
+from chandisvrp.types import Customer, Instance
+
+
+def _instance(n: int = 12) -> Instance:
+    customers = [Customer(100 + i, i, 1 + i % 3, 60, 0, 10**6, "residential") for i in range(1, n + 1)]
+    return Instance("1.0", "t", "Chandigarh", 0, customers, 3, 8)
+
+
+def test_aco_returns_capacity_feasible_cover() -> None:
+    g = build_synthetic_graph(4, 4, 200)
+    inst = _instance()
+    plan = ACOSolver().solve(g, inst, np.random.default_rng(0), 0.2)
+    demand = {c.customer_id: c.demand for c in inst.customers}
+    assert sorted(c for r in plan.routes for c in r) == sorted(demand)
+    assert all(sum(demand[c] for c in r) <= inst.vehicle_capacity for r in plan.routes)
+    assert plan.meta["iterations"] > 0
+
+
+def test_alns_regret_repair_keeps_plan_feasible() -> None:
+    g = build_synthetic_graph(4, 4, 200)
+    inst = _instance()
+    plan = ALNSSolver().solve(g, inst, np.random.default_rng(0), 0.3)
+    demand = {c.customer_id: c.demand for c in inst.customers}
+    assert sorted(c for r in plan.routes for c in r) == sorted(demand)
+    assert all(sum(demand[c] for c in r) <= inst.vehicle_capacity for r in plan.routes)
+    assert plan.meta["iterations"] > 0
+
+
+def test_island_solver_migrates_to_feasible_plan() -> None:
+    from chandisvrp.evaluation.runner import make_solver
+
+    g = build_synthetic_graph(4, 4, 200)
+    inst = _instance()
+    solver = make_solver("alns@2")
+    assert solver.name == "alns@2"
+    plan = solver.solve(g, inst, np.random.default_rng(0), 0.8)
+    demand = {c.customer_id: c.demand for c in inst.customers}
+    assert sorted(c for r in plan.routes for c in r) == sorted(demand)
+    assert all(sum(demand[c] for c in r) <= inst.vehicle_capacity for r in plan.routes)
+    assert len(plan.meta["island_costs"]) == 2
+
+
+def test_ortools_warm_start_respects_time_windows() -> None:
+    pytest.importorskip("ortools")
+    from chandisvrp.solvers.ortools_solver import OrtoolsSolver
+
+    g = build_synthetic_graph(4, 4, 200)
+    inst = _instance(8)
+    inst.customers[0].tw_end_s = OrtoolsSolver.start_s + 60
+    initial = ALNSSolver().solve(g, inst, np.random.default_rng(0), 0.2)
+    plan = OrtoolsSolver().solve(g, inst, np.random.default_rng(0), 1.0, initial=initial)
+    assert plan.meta["warm_start"]
+    assert sorted(c for r in plan.routes for c in r) == sorted(c.customer_id for c in inst.customers)
+    assert any(r[0] == inst.customers[0].customer_id for r in plan.routes)
+    ci = ensure_compiled(g, inst)
+    assert plan.meta["trace"][-1][2] == pytest.approx(plan_length(ci, plan.routes))
+
+
+def test_ortools_keeps_the_instance_fleet_unless_told_to_grow_it() -> None:
+    pytest.importorskip("ortools")
+    from chandisvrp.solvers.ortools_solver import OrtoolsSolver
+
+    g = build_synthetic_graph(4, 4, 200)
+    inst = _instance(8)
+    plan = OrtoolsSolver().solve(g, inst, np.random.default_rng(0), 0.5)
+    assert plan.meta["vehicles"] == 3 and plan.meta["vehicles_added"] == 0
+    assert len(plan.routes) <= inst.n_vehicles
+    inst.n_vehicles = 1
+    solver = OrtoolsSolver()
+    solver.grow_fleet = True
+    plan = solver.solve(g, inst, np.random.default_rng(0), 0.5)
+    assert plan.meta["vehicles"] == 3 and plan.meta["vehicles_added"] == 2
+
+def test_make_solver_passes_start_time_to_every_stage() -> None:
+    pytest.importorskip("ortools")
+    from chandisvrp.evaluation.runner import make_solver
+
+    solver = make_solver("alns@2>ortools", start_s=6 * 3600)
+    islands, ortools = solver.stages
+    assert islands.start_s == ortools.start_s == 6 * 3600
+    g = build_synthetic_graph(4, 4, 200)
+    inst = _instance(8)
+    inst.customers[0].tw_end_s = 6 * 3600 + 60
+    plan = ortools.solve(g, inst, np.random.default_rng(0), 1.0)
+    assert any(r[0] == inst.customers[0].customer_id for r in plan.routes)
+
+
+def test_pipeline_hands_plans_between_stages() -> None:
+    from chandisvrp.evaluation.runner import make_solver
+
+    g = build_synthetic_graph(4, 4, 200)
+    inst = _instance()
+    solver = make_solver("nn2opt>alns>ls")
+    plan = solver.solve(g, inst, np.random.default_rng(0), 0.6)
+    assert [s["name"] for s in plan.meta["stages"]] == ["nn2opt", "alns", "ls"]
+    assert sorted(c for r in plan.routes for c in r) == sorted(c.customer_id for c in inst.customers)
+
+
+def test_route_cache_is_shared_across_solvers_of_one_instance() -> None:
+    from chandisvrp.solvers.pipeline import LocalSearchSolver
+
+    g = build_synthetic_graph(4, 4, 200)
+    inst = _instance()
+    ci = ensure_compiled(g, inst)
+    plan = ALNSSolver().solve(g, inst, np.random.default_rng(0), 0.2, compiled=ci)
+    assert plan.meta["route_cache"]["misses"] > 0
+    polished = LocalSearchSolver().solve(g, inst, np.random.default_rng(0), 0.0, compiled=ci, initial=plan)
+    # Every route ALNS returned was priced by ALNS already.
+    assert polished.meta["route_cache"]["misses"] == 0 and polished.meta["route_cache"]["hits"] > 0
+
+def test_stall_stops_early_with_monotone_trace() -> None:
+    g = build_synthetic_graph(4, 4, 200)
+    solver = ALNSSolver()
+    solver.stall_evals = 20
+    plan = solver.solve(g, _instance(), np.random.default_rng(0), 30.0)
+    costs = [c for _, _, c in plan.meta["trace"]]
+    assert costs == sorted(costs, reverse=True) and len(set(costs)) == len(costs)
+    assert plan.meta["evaluations"] < 10_000
+
+
+def test_metaheuristics_handle_zero_cost_instance() -> None:
+    g = build_synthetic_graph(4, 4, 200)
+    inst = Instance("1.0", "t", "Chandigarh", 0, [Customer(100, 0, 1, 60, 0, 10**6, "residential")], 3, 8)
+    for solver in (ALNSSolver(), ACOSolver()):
+        plan = solver.solve(g, inst, np.random.default_rng(0), 0.05)
+        assert plan.routes == [[100]]
+
+
+class _CrashingSolver(ALNSSolver):
+    name = "crash"
+
+    def solve(self, *args, **kwargs):
+        os._exit(1)
+
+
+def test_island_shared_block_rebuilds_instance_and_survives_crash() -> None:
+    from chandisvrp.evaluation.runner import make_solver
+    from chandisvrp.solvers import islands
+
+    g = build_synthetic_graph(4, 4, 200)
+    inst = _instance()
+    ci = ensure_compiled(g, inst)
+    shm, spec, head = islands._share_problem(ci)
+    try:
+        rebuilt, rci = islands._attached_problem(shm.name, spec, head)
+        assert rebuilt == inst
+        assert np.array_equal(rci.length_m, ci.length_m)
+    finally:
+        islands._ATTACHED.clear()
+        shm.unlink()
+
+    with pytest.raises(BrokenProcessPool):
+        islands.IslandSolver(_CrashingSolver, 2).solve(g, inst, np.random.default_rng(0), 0.2)
+    assert 2 not in islands._POOLS
+    plan = make_solver("alns@2").solve(g, inst, np.random.default_rng(0), 0.4)
+    assert sorted(c for r in plan.routes for c in r) == sorted(c.customer_id for c in inst.customers)
+
+
+def test_islands_over_tiled_matrix_fill_only_instance_tiles(tmp_path: Path) -> None:
+    from chandisvrp.geo.compiled import as_compiled
+    from chandisvrp.geo.matrix import tiled_distance_matrix
+    from chandisvrp.instances.compiled import compile_instance
+    from chandisvrp.solvers import islands
+
+    g = build_synthetic_graph(5, 5, 200)
+    matrix = tiled_distance_matrix(as_compiled(g), sorted(g.nodes), tmp_path / "m", tile_rows=4)
+    inst = _instance(5)
+    ci = compile_instance(inst, matrix)
+    plan = islands.IslandSolver(ALNSSolver, 2).solve(g, inst, np.random.default_rng(0), 0.4, compiled=ci)
+    assert sorted(c for r in plan.routes for c in r) == sorted(c.customer_id for c in inst.customers)
+    # Points sit on nodes 0..5, i.e. the first two tiles of four rows.
+    assert np.load(tmp_path / "m" / "done.npy").tolist() == [1, 1, 0, 0, 0, 0, 0]
+    shm, spec, head = islands._share_problem(ci)
+    try:
+        _, rci = islands._attached_problem(shm.name, spec, head)
+        assert np.allclose(rci.length_m, ci.length_m)
+    finally:
+        islands._ATTACHED.clear()
+        shm.unlink()
@@ -1,4 +1,8 @@
-from chandisvrp.solvers.split import split_by_capacity
+import numpy as np
+
+from chandisvrp.solvers.batch_eval import evaluate_permutations, routes_from_starts
+from chandisvrp.solvers.constructive import route_length
+from chandisvrp.solvers.split import optimal_split, split_by_capacity, split_points
 from chandisvrp.types import Customer
 
 
@@ -7,3 +11,35 @@ def test_split_capacity_respected() -> None:
     routes = split_by_capacity([1, 2, 3, 4, 5, 6], customers, capacity=7)
     cmap = {c.customer_id: c for c in customers}
     assert all(sum(cmap[c].demand for c in r) <= 7 for r in routes)
+
+
+def test_split_points_matches_id_split() -> None:
+    customers = [Customer(i, i, 3, 60, 0, 1000, "residential") for i in range(1, 7)]
+    demand = np.array([0] + [c.demand for c in customers])
+    assert split_points([3, 1, 2, 6, 5, 4], demand, 7) == split_by_capacity([3, 1, 2, 6, 5, 4], customers, 7)
+
+
+def test_optimal_split_beats_greedy_and_respects_fleet() -> None:
+    rng = np.random.default_rng(1)
+    dist = rng.uniform(1, 50, size=(13, 13))
+    demand = np.array([0] + rng.integers(1, 5, size=12).tolist())
+    tour = rng.permutation(np.arange(1, 13)).tolist()
+    routes, cost = optimal_split(tour, dist, demand, capacity=8)
+    assert [p for r in routes for p in r] == tour
+    assert all(demand[r].sum() <= 8 for r in routes)
+    assert np.isclose(cost, sum(route_length(r, dist) for r in routes))
+    assert cost <= sum(route_length(r, dist) for r in split_points(tour, demand, 8)) + 1e-9
+    fleet_routes, fleet_cost = optimal_split(tour, dist, demand, capacity=8, n_vehicles=len(routes) - 1 or 1)
+    assert fleet_cost >= cost - 1e-9
+
+
+def test_batch_evaluator_matches_greedy_split() -> None:
+    rng = np.random.default_rng(4)
+    dist = rng.uniform(1, 50, size=(11, 11))
+    demand = np.array([0] + rng.integers(1, 6, size=10).tolist())
+    perms = np.stack([rng.permutation(np.arange(1, 11)) for _ in range(5)])
+    costs, starts = evaluate_permutations(perms, dist, demand, 9)
+    for perm, cost, st in zip(perms, costs, starts):
+        routes = split_points(perm.tolist(), demand, 9)
+        assert routes_from_starts(perm, st) == routes
+        assert np.isclose(cost, sum(route_length(r, dist) for r in routes))
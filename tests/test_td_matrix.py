@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from chandisvrp.geo.matrix import instance_matrix
+from chandisvrp.geo.osm_graph import build_synthetic_graph
+from chandisvrp.instances.compiled import compile_instance
+from chandisvrp.stochastic.simulator import simulate_plan
+from chandisvrp.stochastic.td_matrix import DAY_S, TimeDependentMatrix, evaluate_plan
+from chandisvrp.types import Customer, Instance, RoutePlan
+
+CFG = {
+    "start_hour": 7.5,
+    "peak_hours": [8.0, 17.0],
+    "peak_sigma_h": 1.5,
+    "congestion_strength": 0.35,
+    "distance_lambda_m": 2500,
+    "lognormal": {"base_mu": 0.0, "peak_mu": 0.0, "base_sigma": 0.0, "peak_sigma": 0.0},
+    "accidents": {"prob_per_leg": 0.0, "delay_mean_s": 240, "delay_std_s": 90},
+}
+
+
+def _setup(slice_min: float = 15.0):
+    g = build_synthetic_graph(5, 5, 400)
+    customers = [
+        Customer(10 + i, node, 1, 120, 8 * 3600, 8 * 3600 + 300, "residential")
+        for i, node in enumerate([6, 18, 24, 12, 3], start=1)
+    ]
+    inst = Instance("1.0", "td", "Chandigarh", 0, customers, 2, 10)
+    matrix = instance_matrix(g, inst)
+    return g, inst, compile_instance(inst, matrix), TimeDependentMatrix(matrix, CFG, slice_min)
+
+
+def test_slice_factor_interpolates_between_slice_starts() -> None:
+    _, _, _, td = _setup()
+    assert td.n_slices == 96
+    assert td.slice_factor(8 * 3600.0) == pytest.approx(td.factor[32])
+    half = td.slice_factor(8 * 3600.0 + 450.0)
+    assert half == pytest.approx(0.5 * (td.factor[32] + td.factor[33]))
+
+
+def test_slice_factor_wraps_at_midnight() -> None:
+    _, _, _, td = _setup()
+    late = DAY_S - 300.0
+    w = (late % td.slice_s) / td.slice_s
+    assert td.slice_factor(late) == pytest.approx((1 - w) * td.factor[-1] + w * td.factor[0])
+    assert td.slice_factor(DAY_S + 3600.0) == pytest.approx(td.slice_factor(3600.0))
+    assert td.slice_factor(np.array([0.0, DAY_S])).tolist() == pytest.approx([td.factor[0]] * 2)
+
+
+def test_slice_matrix_covers_instance_rows_and_is_cached() -> None:
+    _, _, ci, _ = _setup()
+    td = TimeDependentMatrix(ci.matrix, CFG, rows=ci.rows[:3])
+    m = td.slice_matrix(32)
+    assert m.shape == (3, 3)
+    assert td.slice_matrix(32 + td.n_slices) is m
+    i, j = ci.rows[1], ci.rows[2]
+    assert m[1, 2] == pytest.approx(td.travel_time(i, j, 8 * 3600.0))
+
+def test_evaluate_plan_matches_noise_free_simulation() -> None:
+    g, inst, ci, td = _setup(slice_min=1.0)
+    plan = RoutePlan([[11, 12, 13], [14, 15]])
+    planned = evaluate_plan(ci, plan, td, CFG["start_hour"] * 3600.0)
+    simulated = simulate_plan(g, inst, plan, CFG, np.random.default_rng(0), compiled=ci)
+    assert planned.total_distance_m == simulated.total_distance_m
+    assert planned.total_time_s == pytest.approx(simulated.total_time_s, rel=1e-4)
+    assert planned.late_stops == simulated.late_stops > 0
+    assert planned.lateness_values_s == pytest.approx(simulated.lateness_values_s, rel=1e-3)
+
+
+def test_evaluate_plan_floors_co_located_legs_like_the_simulator() -> None:
+    g, inst, _, td = _setup()
+    inst.customers[1].node = inst.customers[0].node
+    ci = compile_instance(inst, td.matrix)
+    plan = RoutePlan([[11, 12]])
+    planned = evaluate_plan(ci, plan, td, CFG["start_hour"] * 3600.0)
+    simulated = simulate_plan(g, inst, plan, CFG, np.random.default_rng(0), compiled=ci)
+    assert planned.total_time_s == pytest.approx(simulated.total_time_s, rel=1e-4)
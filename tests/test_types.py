@@ -0,0 +1,28 @@
+import numpy as np
+
+from chandisvrp.types import FlatRoutePlan, RoutePlan, SimulationOutcome
+
+
+def test_flat_route_plan_roundtrip() -> None:
+    plan = RoutePlan([[3, 1], [], [7, 2, 5]], planned_cost=12.5, meta={"k": 1})
+    flat = plan.to_flat()
+    assert flat.customers.dtype == np.int32
+    assert flat.offsets.tolist() == [0, 2, 2, 5]
+    assert flat.route(2).tolist() == [7, 2, 5]
+    back = flat.to_plan()
+    assert back.routes == plan.routes
+    assert back.planned_cost == 12.5 and back.meta == {"k": 1}
+    assert FlatRoutePlan.from_routes([]).routes == []
+
+
+def test_outcome_stores_lateness_as_array() -> None:
+    out = SimulationOutcome(1.0, 2.0, 3.0, False, 2, [5.0, 1.5])
+    assert isinstance(out.lateness_values_s, np.ndarray)
+    assert not hasattr(out, "__dict__")
+
+
+def test_outcome_equality_compares_lateness_arrays() -> None:
+    a = SimulationOutcome(1.0, 2.0, 3.0, False, 2, [5.0, 1.5])
+    assert a == SimulationOutcome(1.0, 2.0, 3.0, False, 2, np.array([5.0, 1.5]))
+    assert a != SimulationOutcome(1.0, 2.0, 3.0, False, 2, [5.0, 2.5])
+    assert a != SimulationOutcome(1.0, 2.0, 3.0, False, 2, [5.0])